@@ -10,195 +10,648 @@ Version: 1.1.0
 Last Updated: 2026-02-12
 """
 
+import copy
 import json
+import mmap
+import re
 import sys
 import os
-from collections import defaultdict
-
-from pptx import Presentation
-from pptx.util import Inches, Pt, Emu
-from pptx.dml.color import RGBColor
-from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
-from pptx.enum.shapes import MSO_SHAPE
+from collections import defaultdict, namedtuple
+from functools import lru_cache, wraps
+from typing import Any, Iterable, Iterator
+
+try:
+    import orjson  # optional: faster drop-in for json.loads
+except ImportError:
+    orjson = None
+
+try:
+    import ijson  # optional: stream configurationItems of very large files
+except ImportError:
+    ijson = None
+
+# python-pptx is only needed by DiagramGenerator; it is imported on first use
+# so parser-only callers (Excel export, web API) never pay for loading it.
+Presentation = Inches = Pt = RGBColor = PP_ALIGN = MSO_SHAPE = PptxShape = None
+etree = None
+
+# Point sizes the generator uses (line widths, margins, fonts) -> pptx Pt
+# length, filled by _lazy_pptx() so helpers index a table per shape instead
+# of constructing a new Length each time.
+PT = {}
+_PT_SIZES = (0, 0.5, 1, 1.5, 1.8, 2, 2.5, 3, 4, *range(5, 41))
+
+# Inch offsets/sizes the generator lays shapes out with -> pptx Inches length,
+# filled by _lazy_pptx() alongside PT.
+IN = {}
+_IN_SIZES = (
+    0.02, 0.05, 0.06, 0.08, 0.1, 0.12, 0.15, 0.16, 0.18, 0.2, 0.22, 0.225,
+    0.25, 0.28, 0.3, 0.35, 0.4, 0.42, 0.45, 0.5, 0.52, 0.55, 0.6, 0.7,
+    0.75, 0.8, 0.85, 0.9, 1, 1.2, 1.35, 1.5, 1.7, 1.9, 2, 2.1, 2.4, 2.5,
+    2.6, 3.5, 4, 4.5, 4.8, 5.2, 6, 7.5, 8, 8.7, 10, 10.5, 10.7, 11.3, 12, 12.5,
+    13.333
+)
+
+# Clark-notation tags for the arrowhead XML built for DiagramGenerator._new_arrow
+# (what pptx.oxml.ns.qn() returns, without importing python-pptx here).
+_NS_A = "http://schemas.openxmlformats.org/drawingml/2006/main"
+_QN_TAILEND = f"{{{_NS_A}}}tailEnd"
+# Table cell border edges (a:tcPr children, in schema order) for _add_table
+_QN_CELL_EDGES = tuple(f"{{{_NS_A}}}{edge}" for edge in ("lnL", "lnR", "lnT", "lnB"))
+_TAILEND_ATTRS = {"type": "triangle", "w": "med", "len": "med"}
+# <a:tailEnd type="triangle" .../> built once by _lazy_pptx(); each new
+# arrow style appends a copy instead of assembling the element again.
+_TAILEND_TEMPLATE = None
+
+
+def _lazy_pptx() -> None:
+    """Import python-pptx into module globals (no-op after the first call)."""
+    global Presentation, Inches, Pt, RGBColor, PP_ALIGN, MSO_SHAPE, PptxShape, etree
+    global _TAILEND_TEMPLATE
+    if Presentation is not None:
+        return
+    from lxml import etree
+    from pptx import Presentation
+    from pptx.util import Inches, Pt
+    from pptx.dml.color import RGBColor
+    from pptx.enum.text import PP_ALIGN
+    from pptx.enum.shapes import MSO_SHAPE
+    from pptx.shapes.autoshape import Shape as PptxShape
+    PT.update((size, Pt(size)) for size in _PT_SIZES)
+    IN.update((size, Inches(size)) for size in _IN_SIZES)
+    _TAILEND_TEMPLATE = etree.Element(_QN_TAILEND, _TAILEND_ATTRS)
 
 
 # ============================================================
 # Color Palette
 # ============================================================
+Color = namedtuple("Color", "r g b")
+
+
+_RGB_CACHE = {}  # Color -> RGBColor, one pptx object per distinct color
+
+
+def _rgb(color: Color) -> "RGBColor":
+    """Convert a Color to the pptx RGBColor it is drawn with."""
+    rgb = _RGB_CACHE.get(color)
+    if rgb is None:
+        rgb = _RGB_CACHE[color] = RGBColor(*color)
+    return rgb
+
+
 class Colors:
     # VPC
-    VPC_FILL = RGBColor(0xE8, 0xF5, 0xE9)       # light green
-    VPC_BORDER = RGBColor(0x2E, 0x7D, 0x32)      # dark green
+    VPC_FILL = Color(0xE8, 0xF5, 0xE9)          # light green
+    VPC_BORDER = Color(0x2E, 0x7D, 0x32)         # dark green
 
     # Subnet tiers
-    PUBLIC_FILL = RGBColor(0xE3, 0xF2, 0xFD)     # light blue
-    PUBLIC_BORDER = RGBColor(0x15, 0x65, 0xC0)    # dark blue
-    PRIVATE_FILL = RGBColor(0xFD, 0xF0, 0xE0)    # light orange
-    PRIVATE_BORDER = RGBColor(0xE6, 0x51, 0x00)   # dark orange
-    ISOLATED_FILL = RGBColor(0xF3, 0xE5, 0xF5)   # light purple
-    ISOLATED_BORDER = RGBColor(0x6A, 0x1B, 0x9A)  # dark purple
+    PUBLIC_FILL = Color(0xE3, 0xF2, 0xFD)        # light blue
+    PUBLIC_BORDER = Color(0x15, 0x65, 0xC0)       # dark blue
+    PRIVATE_FILL = Color(0xFD, 0xF0, 0xE0)       # light orange
+    PRIVATE_BORDER = Color(0xE6, 0x51, 0x00)      # dark orange
+    ISOLATED_FILL = Color(0xF3, 0xE5, 0xF5)      # light purple
+    ISOLATED_BORDER = Color(0x6A, 0x1B, 0x9A)     # dark purple
 
     # Resources
-    IGW_FILL = RGBColor(0xFF, 0xF9, 0xC4)        # yellow
-    IGW_BORDER = RGBColor(0xF5, 0x7F, 0x17)
-    NAT_FILL = RGBColor(0xFF, 0xEC, 0xB3)
-    NAT_BORDER = RGBColor(0xFF, 0x8F, 0x00)
-    ALB_FILL = RGBColor(0xBB, 0xDE, 0xFB)
-    ALB_BORDER = RGBColor(0x0D, 0x47, 0xA1)
-    EC2_FILL = RGBColor(0xFF, 0xCC, 0xBC)
-    EC2_BORDER = RGBColor(0xBF, 0x36, 0x0C)
-    RDS_FILL = RGBColor(0xC5, 0xCA, 0xE9)
-    RDS_BORDER = RGBColor(0x28, 0x35, 0x93)
+    IGW_FILL = Color(0xFF, 0xF9, 0xC4)           # yellow
+    IGW_BORDER = Color(0xF5, 0x7F, 0x17)
+    NAT_FILL = Color(0xFF, 0xEC, 0xB3)
+    NAT_BORDER = Color(0xFF, 0x8F, 0x00)
+    ALB_FILL = Color(0xBB, 0xDE, 0xFB)
+    ALB_BORDER = Color(0x0D, 0x47, 0xA1)
+    EC2_FILL = Color(0xFF, 0xCC, 0xBC)
+    EC2_BORDER = Color(0xBF, 0x36, 0x0C)
+    RDS_FILL = Color(0xC5, 0xCA, 0xE9)
+    RDS_BORDER = Color(0x28, 0x35, 0x93)
 
     # WAF
-    WAF_FILL = RGBColor(0xFF, 0xE0, 0xE0)         # light red/pink
-    WAF_BORDER = RGBColor(0xC6, 0x28, 0x28)       # dark red
+    WAF_FILL = Color(0xFF, 0xE0, 0xE0)            # light red/pink
+    WAF_BORDER = Color(0xC6, 0x28, 0x28)          # dark red
     # S3
-    S3_FILL = RGBColor(0xC8, 0xE6, 0xC9)          # light green
-    S3_BORDER = RGBColor(0x2E, 0x7D, 0x32)        # dark green
+    S3_FILL = Color(0xC8, 0xE6, 0xC9)             # light green
+    S3_BORDER = Color(0x2E, 0x7D, 0x32)           # dark green
 
     # Arrows
-    ARROW_EXTERNAL = RGBColor(0xFF, 0x00, 0x00)   # red - external access
-    ARROW_INTERNAL = RGBColor(0x33, 0x33, 0x33)   # dark gray
-    ARROW_PEERING = RGBColor(0x00, 0x96, 0x88)    # teal
+    ARROW_EXTERNAL = Color(0xFF, 0x00, 0x00)      # red - external access
+    ARROW_INTERNAL = Color(0x33, 0x33, 0x33)      # dark gray
+    ARROW_PEERING = Color(0x00, 0x96, 0x88)       # teal
+    ARROW_NAT = NAT_BORDER                        # orange - NAT outbound
 
     # Alert
-    ALERT_RED = RGBColor(0xFF, 0x00, 0x00)
-    TEXT_BLACK = RGBColor(0x00, 0x00, 0x00)
-    TEXT_WHITE = RGBColor(0xFF, 0xFF, 0xFF)
-    TEXT_GRAY = RGBColor(0x66, 0x66, 0x66)
+    ALERT_RED = Color(0xFF, 0x00, 0x00)
+    TEXT_BLACK = Color(0x00, 0x00, 0x00)
+    TEXT_WHITE = Color(0xFF, 0xFF, 0xFF)
+    TEXT_GRAY = Color(0x66, 0x66, 0x66)
 
     # Internet
-    INTERNET_FILL = RGBColor(0xE0, 0xE0, 0xE0)
-    INTERNET_BORDER = RGBColor(0x61, 0x61, 0x61)
+    INTERNET_FILL = Color(0xE0, 0xE0, 0xE0)
+    INTERNET_BORDER = Color(0x61, 0x61, 0x61)
 
     # Peering
-    PEERING_FILL = RGBColor(0xB2, 0xDF, 0xDB)
-    PEERING_BORDER = RGBColor(0x00, 0x69, 0x5C)
+    PEERING_FILL = Color(0xB2, 0xDF, 0xDB)
+    PEERING_BORDER = Color(0x00, 0x69, 0x5C)
+
+    # Tables (SG detail slide)
+    TABLE_HEADER_ALERT = Color(0xFF, 0xCC, 0xCC)
+    TABLE_ROW_ALERT = Color(0xFF, 0xF0, 0xF0)
+    TABLE_BORDER = Color(0xCC, 0xCC, 0xCC)
+
+    # Shape styles: kind -> (fill, border)
+    STYLES = {
+        "VPC": (VPC_FILL, VPC_BORDER),
+        "Public": (PUBLIC_FILL, PUBLIC_BORDER),
+        "Private": (PRIVATE_FILL, PRIVATE_BORDER),
+        "Isolated": (ISOLATED_FILL, ISOLATED_BORDER),
+        "IGW": (IGW_FILL, IGW_BORDER),
+        "NAT": (NAT_FILL, NAT_BORDER),
+        "ALB": (ALB_FILL, ALB_BORDER),
+        "EC2": (EC2_FILL, EC2_BORDER),
+        "RDS": (RDS_FILL, RDS_BORDER),
+        "WAF": (WAF_FILL, WAF_BORDER),
+        "S3": (S3_FILL, S3_BORDER),
+        "Internet": (INTERNET_FILL, INTERNET_BORDER),
+        "Peering": (PEERING_FILL, PEERING_BORDER),
+    }
+
+
+def _to_gray(color: Color) -> Color:
+    """Map a Color to the gray of equal luma (ITU-R BT.601)."""
+    y = round(0.299 * color.r + 0.587 * color.g + 0.114 * color.b)
+    return Color(y, y, y)
+
+
+def make_palette(mode: str = "color") -> type:
+    """Return the palette class used to draw shapes for an output mode.
+
+    The palette is specialized once, so drawing code never branches on mode.
+
+    Args:
+        mode: "color" (default) or "grayscale" (print-friendly).
+
+    Returns:
+        Colors, or a Colors subclass with every color converted.
+    """
+    if mode == "color":
+        return Colors
+    if mode == "grayscale":
+        attrs = {name: _to_gray(value) for name, value in vars(Colors).items()
+                 if isinstance(value, Color)}
+        attrs["STYLES"] = {kind: (_to_gray(fill), _to_gray(border))
+                           for kind, (fill, border) in Colors.STYLES.items()}
+        return type("GrayscaleColors", (Colors,), attrs)
+    raise ValueError(f"Unknown palette mode: {mode}")
+
+
+# Palette used by DiagramGenerator (DIAGRAM_PALETTE=color|grayscale)
+try:
+    PALETTE = make_palette(os.environ.get("DIAGRAM_PALETTE", "color"))
+except ValueError as e:
+    print(f"Warning: {e}; using color palette", file=sys.stderr)
+    PALETTE = Colors
+
+
+# ============================================================
+# IPv4 helpers
+# ============================================================
+_IPV4_RE = re.compile(r"(\d{1,3})\.(\d{1,3})\.(\d{1,3})\.(\d{1,3})")
+
+
+@lru_cache(maxsize=8192)
+def _ipv4_to_int(ip: str) -> int | None:
+    """Parse dotted-quad IPv4 text to a 32-bit int (None if not IPv4).
+
+    Cached: the same private IPs show up on both ENIs and instances.
+    """
+    m = _IPV4_RE.fullmatch(ip)
+    if m is None:
+        return None
+    a, b, c, d = map(int, m.groups())
+    if a > 255 or b > 255 or c > 255 or d > 255:
+        return None
+    return (a << 24) | (b << 16) | (c << 8) | d
+
+
+def _int_to_ipv4(n: int) -> str:
+    """Format a 32-bit int as dotted-quad IPv4 text."""
+    return f"{n >> 24}.{(n >> 16) & 0xFF}.{(n >> 8) & 0xFF}.{n & 0xFF}"
+
+
+def _common_prefix_len(addrs: list[int]) -> int:
+    """Return the number of leading bits shared by all 32-bit addresses."""
+    base = addrs[0]
+    differing = 0
+    for n in addrs:
+        differing |= base ^ n
+    return 32 - differing.bit_length()
+
+
+# Source CIDRs that mean "anywhere" in an SG rule. Only ipRanges (cidrIp)
+# are scanned, so this is the IPv4 form; ipv6Ranges are not audited.
+_OPEN_CIDRS = frozenset(("0.0.0.0/0",))
+
+
+# ============================================================
+# Snapshot normalization constants
+# ============================================================
+# Resource types relevant for external audit
+_AUDIT_RESOURCE_TYPES = frozenset(map(sys.intern, {
+    # Networking
+    "AWS::EC2::VPC",
+    "AWS::EC2::Subnet",
+    "AWS::EC2::InternetGateway",
+    "AWS::EC2::NatGateway",
+    "AWS::EC2::VPCEndpoint",
+    "AWS::EC2::NetworkInterface",
+    "AWS::EC2::Instance",
+    "AWS::EC2::SecurityGroup",
+    "AWS::EC2::RouteTable",
+    "AWS::EC2::VPCPeeringConnection",
+    "AWS::ElasticLoadBalancingV2::LoadBalancer",
+    "AWS::CloudFront::Distribution",
+    "AWS::ApiGateway::RestApi",
+    "AWS::ApiGatewayV2::Api",
+    "AWS::Route53::HostedZone",
+    # Compute
+    "AWS::Lambda::Function",
+    "AWS::ECS::Cluster",
+    "AWS::ECS::Service",
+    "AWS::ECS::TaskDefinition",
+    "AWS::EKS::Cluster",
+    "AWS::AutoScaling::AutoScalingGroup",
+    # Database / Storage
+    "AWS::RDS::DBInstance",
+    "AWS::DynamoDB::Table",
+    "AWS::ElastiCache::CacheCluster",
+    "AWS::Redshift::Cluster",
+    "AWS::S3::Bucket",
+    # Messaging
+    "AWS::SQS::Queue",
+    "AWS::SNS::Topic",
+    # Security / Monitoring
+    "AWS::WAFv2::WebACL",
+    "AWS::KMS::Key",
+    "AWS::CloudTrail::Trail",
+    "AWS::CloudWatch::Alarm",
+    # Other
+    "AWS::ElasticBeanstalk::Environment",
+}))
+
+
+@lru_cache(maxsize=4096)
+def _to_camel(key: str) -> str:
+    """Convert PascalCase or mixed key to camelCase.
+
+    CidrBlock -> cidrBlock, VpcId -> vpcId, DBInstanceClass -> dBInstanceClass
+
+    Cached: snapshots repeat the same few hundred field names.
+    """
+    if not key or not key[0].isupper():
+        return key
+    # Handle leading uppercase run (e.g. DBInstance -> dBInstance)
+    i = 0
+    while i < len(key) - 1 and key[i].isupper() and key[i + 1].isupper():
+        i += 1
+    if i == 0:
+        return key[0].lower() + key[1:]
+    # e.g. "DBInstanceClass" -> i=1, want "dBInstanceClass"
+    return key[:i].lower() + key[i:]
 
 
 # ============================================================
 # Parse AWS Config Snapshot
 # ============================================================
+def _memoized(method):
+    """Cache a parser query per instance, keyed by its positional args.
+
+    The cache lives on the parser (self._cache), so it is dropped together
+    with the parser instead of pinning it like a method-level lru_cache.
+    Callers share the returned object and must not mutate it.
+    """
+    name = method.__name__
+
+    @wraps(method)
+    def wrapper(self, *args):
+        key = (name, *args)
+        cache = self._cache
+        if key in cache:
+            return cache[key]
+        result = cache[key] = method(self, *args)
+        return result
+
+    return wrapper
+
+
 class AWSConfigParser:
     """Parse AWS Config snapshot JSON and extract audit-relevant info."""
 
-    # Resource types relevant for external audit
-    AUDIT_RESOURCE_TYPES = {
-        # Networking
-        "AWS::EC2::VPC",
-        "AWS::EC2::Subnet",
-        "AWS::EC2::InternetGateway",
-        "AWS::EC2::NatGateway",
-        "AWS::EC2::VPCEndpoint",
-        "AWS::EC2::NetworkInterface",
-        "AWS::EC2::Instance",
-        "AWS::EC2::SecurityGroup",
-        "AWS::EC2::RouteTable",
-        "AWS::EC2::VPCPeeringConnection",
-        "AWS::ElasticLoadBalancingV2::LoadBalancer",
-        "AWS::CloudFront::Distribution",
-        "AWS::ApiGateway::RestApi",
-        "AWS::ApiGatewayV2::Api",
-        "AWS::Route53::HostedZone",
-        # Compute
-        "AWS::Lambda::Function",
-        "AWS::ECS::Cluster",
-        "AWS::ECS::Service",
-        "AWS::ECS::TaskDefinition",
-        "AWS::EKS::Cluster",
-        "AWS::AutoScaling::AutoScalingGroup",
-        # Database / Storage
-        "AWS::RDS::DBInstance",
-        "AWS::DynamoDB::Table",
-        "AWS::ElastiCache::CacheCluster",
-        "AWS::Redshift::Cluster",
-        "AWS::S3::Bucket",
-        # Messaging
-        "AWS::SQS::Queue",
-        "AWS::SNS::Topic",
-        # Security / Monitoring
-        "AWS::WAFv2::WebACL",
-        "AWS::KMS::Key",
-        "AWS::CloudTrail::Trail",
-        "AWS::CloudWatch::Alarm",
-        # Other
-        "AWS::ElasticBeanstalk::Environment",
+    # Module-level originals are used in the hot loops; kept here for callers
+    AUDIT_RESOURCE_TYPES = _AUDIT_RESOURCE_TYPES
+    _to_camel = staticmethod(_to_camel)
+
+    @classmethod
+    def _normalize_keys_inplace(cls, root):
+        """Convert all dict keys under root from PascalCase to camelCase.
+
+        Walks the tree with an explicit stack and edits it in place; a dict is
+        only rebuilt (keeping key order) when one of its keys changes.
+        """
+        camel = _to_camel
+        stack = [root]
+        while stack:
+            obj = stack.pop()
+            if isinstance(obj, dict):
+                for k in obj:
+                    if camel(k) != k:
+                        items = list(obj.items())
+                        obj.clear()
+                        for key, value in items:
+                            obj[camel(key)] = value
+                        break
+                children = obj.values()
+            else:
+                children = obj
+            for v in children:
+                if isinstance(v, (dict, list)):
+                    stack.append(v)
+
+    # Alternate spellings of configuration keys -> the one getters read
+    CONFIG_KEY_ALIASES = {
+        "dbSubnetGroup": "dBSubnetGroup",
+        "routeSet": "routes",
+        "routeTableAssociationSet": "associations",
+    }
+    ROUTE_KEY_ALIASES = {
+        "destinationCidr": "destinationCidrBlock",
     }
 
+    @classmethod
+    def _apply_key_aliases(cls, cfg: dict) -> None:
+        """Fold alias keys into their canonical name (canonical key wins)."""
+        for old, new in cls.CONFIG_KEY_ALIASES.items():
+            if old in cfg:
+                cfg.setdefault(new, cfg.pop(old))
+        routes = cfg.get("routes")
+        if isinstance(routes, list):
+            for r in routes:
+                if isinstance(r, dict):
+                    for old, new in cls.ROUTE_KEY_ALIASES.items():
+                        if old in r:
+                            r.setdefault(new, r.pop(old))
+
+    # Per-item snapshot bookkeeping that nothing reads; not retained
+    DROPPED_ITEM_KEYS = (
+        "relatedEvents",
+        "configurationItemMD5Hash",
+        "configurationStateMd5Hash",
+        "configurationStateId",
+        "configurationStateID",
+        "configurationItemVersion",
+    )
+
+    # Snapshots at least this large are streamed with ijson (if installed)
+    STREAM_MIN_BYTES = 64 * 1024 * 1024
+
     @staticmethod
-    def _to_camel(key):
-        """Convert PascalCase or mixed key to camelCase.
+    def _loads(data: bytes | str) -> Any:
+        """Decode JSON text/bytes with orjson when available."""
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
+
+    @classmethod
+    def _iter_snapshot_items(cls, snapshot_path: str) -> Iterator[dict]:
+        """Yield snapshot configurationItems one at a time.
 
-        CidrBlock -> cidrBlock, VpcId -> vpcId, DBInstanceClass -> dBInstanceClass
+        Large files are streamed with ijson so only one item is materialized
+        at a time. Everything else is decoded in one go (orjson if installed,
+        otherwise stdlib json), which is faster when memory is not a concern.
         """
-        if not key or not key[0].isupper():
-            return key
-        # Handle leading uppercase run (e.g. DBInstance -> dBInstance)
-        i = 0
-        while i < len(key) - 1 and key[i].isupper() and key[i + 1].isupper():
-            i += 1
-        if i == 0:
-            return key[0].lower() + key[1:]
-        # e.g. "DBInstanceClass" -> i=1, want "dBInstanceClass"
-        return key[:i].lower() + key[i:]
+        if (ijson is not None
+                and os.path.getsize(snapshot_path) >= cls.STREAM_MIN_BYTES):
+            with open(snapshot_path, "rb") as f:
+                yield from ijson.items(f, "configurationItems.item", use_float=True)
+            return
+
+        data = cls._load_snapshot(snapshot_path)
+        yield from data.get("configurationItems", [])
 
     @classmethod
-    def _normalize_keys(cls, obj):
-        """Recursively convert all dict keys from PascalCase to camelCase."""
-        if isinstance(obj, dict):
-            return {cls._to_camel(k): cls._normalize_keys(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [cls._normalize_keys(item) for item in obj]
-        return obj
+    def _load_snapshot(cls, snapshot_path: str) -> Any:
+        """Decode a whole snapshot file.
 
-    def __init__(self, snapshot_path):
-        with open(snapshot_path, "r", encoding="utf-8") as f:
-            self.data = json.load(f)
+        With orjson the file is memory-mapped and decoded straight from the
+        mapping, so no file-sized bytes copy is made. Otherwise (or if the
+        file cannot be mapped, e.g. it is empty) it is read and decoded.
+        """
+        with open(snapshot_path, "rb") as f:
+            if orjson is not None:
+                try:
+                    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except (ValueError, OSError):
+                    mm = None
+                if mm is not None:
+                    with mm, memoryview(mm) as view:
+                        return orjson.loads(view)
+            return cls._loads(f.read())
 
-        self.items = self.data.get("configurationItems", [])
-        self.by_type = defaultdict(list)
+    def __init__(self, snapshot_path):
+        # Every audited type has a (possibly empty) list; other types are
+        # never stored, so a missing key is a typo and raises
+        self.by_type = {rt: [] for rt in sorted(_AUDIT_RESOURCE_TYPES)}
         self.by_id = {}
+        self.instances_by_subnet = defaultdict(list)
+        self._cache = {}  # @_memoized query results
+
+        for item in self._iter_snapshot_items(snapshot_path):
+            # Only audited types are kept; skip the rest before normalizing
+            # Interned so the set and by_type lookups compare by identity
+            rt = sys.intern(item.get("resourceType") or "")
+            if rt not in _AUDIT_RESOURCE_TYPES:
+                continue
 
-        for item in self.items:
-            # Normalize None -> empty dict
-            if item.get("configuration") is None:
-                item["configuration"] = {}
+            # Normalize None -> empty dict. Every kept item ends up with dict
+            # "configuration" / "tags" and a "relationships" list, so the
+            # getters below index them directly.
+            cfg = item.get("configuration")
+            if cfg is None:
+                cfg = item["configuration"] = {}
             if item.get("relationships") is None:
                 item["relationships"] = []
 
-            # Parse configuration if it's a JSON string
-            cfg = item.get("configuration")
-            if isinstance(cfg, str):
+            # Parse configuration if it's a JSON object/array string
+            if isinstance(cfg, str) and cfg.lstrip()[:1] in ("{", "["):
                 try:
-                    item["configuration"] = json.loads(cfg)
+                    cfg = item["configuration"] = self._loads(cfg)
                 except (json.JSONDecodeError, TypeError):
                     pass
 
             # Normalize configuration keys: PascalCase -> camelCase
-            cfg = item.get("configuration")
             if isinstance(cfg, dict):
-                item["configuration"] = self._normalize_keys(cfg)
+                if cfg:
+                    self._normalize_keys_inplace(cfg)
+                    self._apply_key_aliases(cfg)
+            else:
+                # Undecodable / non-object configuration: getters rely on a dict
+                item["configuration"] = {}
 
             # Normalize tags: list-of-dicts -> simple dict
             tags = item.get("tags")
             if isinstance(tags, list):
-                tag_dict = {}
-                for t in tags:
-                    if isinstance(t, dict):
-                        k = t.get("key", t.get("Key", ""))
-                        v = t.get("value", t.get("Value", ""))
-                        if k:
-                            tag_dict[k] = v
-                item["tags"] = tag_dict
+                # "k in t" first: the nested .get fallback would always run
+                item["tags"] = {
+                    k: t["value"] if "value" in t else t.get("Value", "")
+                    for t in tags
+                    if isinstance(t, dict)
+                    and (k := t["key"] if "key" in t else t.get("Key", ""))
+                }
             elif not isinstance(tags, dict):
                 item["tags"] = {}
 
-            rt = item.get("resourceType", "")
+            for key in self.DROPPED_ITEM_KEYS:
+                item.pop(key, None)
+            self._intern_ids(item)
+            if rt == "AWS::EC2::SecurityGroup":
+                self._intern_sg_rules(item["configuration"])
             rid = item.get("resourceId", "")
-            if rt in self.AUDIT_RESOURCE_TYPES:
-                self.by_type[rt].append(item)
-                self.by_id[rid] = item
+            # Name tag, else the resource id: the default label of every getter
+            item["_display_name"] = item["tags"].get("Name", rid)
+            self.by_type[rt].append(item)
+            self.by_id[rid] = item
+            if rt == "AWS::EC2::Instance":
+                self._index_instance_subnets(item)
+
+    @staticmethod
+    def _intern_ids(item: dict) -> None:
+        """Intern id strings that recur across items.
+
+        Resource/VPC/subnet ids and types are referenced from many other
+        items (relationships, configuration). Interning makes the copies share
+        one object and lets dict lookups on them short-circuit on identity.
+        """
+        intern = sys.intern
+        for key in ("resourceType", "resourceId", "awsRegion"):
+            v = item.get(key)
+            if isinstance(v, str):
+                item[key] = intern(v)
+        cfg = item.get("configuration")
+        if isinstance(cfg, dict):
+            for key in ("vpcId", "subnetId"):
+                v = cfg.get(key)
+                if isinstance(v, str):
+                    cfg[key] = intern(v)
+        for rel in item["relationships"]:
+            if isinstance(rel, dict):
+                for key in ("resourceType", "resourceId"):
+                    v = rel.get(key)
+                    if isinstance(v, str):
+                        rel[key] = intern(v)
+
+    @staticmethod
+    def _intern_sg_rules(cfg: dict) -> None:
+        """Intern the protocol / CIDR / peer-group strings of SG rules.
+
+        The same few values ("tcp", "-1", "0.0.0.0/0", sg ids) repeat across
+        thousands of rules; sharing one object saves memory and makes the
+        open-CIDR set test an identity hit.
+        """
+        intern = sys.intern
+        for key in ("ipPermissions", "ipPermissionsEgress"):
+            rules = cfg.get(key)
+            if not isinstance(rules, list):
+                continue
+            for rule in rules:
+                if not isinstance(rule, dict):
+                    continue
+                v = rule.get("ipProtocol")
+                if isinstance(v, str):
+                    rule["ipProtocol"] = intern(v)
+                ranges = rule.get("ipRanges")
+                if isinstance(ranges, list):
+                    for i, ip_range in enumerate(ranges):
+                        if isinstance(ip_range, str):
+                            ranges[i] = intern(ip_range)
+                        elif isinstance(ip_range, dict):
+                            v = ip_range.get("cidrIp")
+                            if isinstance(v, str):
+                                ip_range["cidrIp"] = intern(v)
+                pairs = rule.get("userIdGroupPairs")
+                if isinstance(pairs, list):
+                    for pair in pairs:
+                        if isinstance(pair, dict):
+                            v = pair.get("groupId")
+                            if isinstance(v, str):
+                                pair["groupId"] = intern(v)
+
+    def _index_instance_subnets(self, item: dict) -> None:
+        """Register an EC2 instance under every subnet it references.
+
+        Primary: configuration.subnetId. Fallback: relationships → Subnet.
+        """
+        cfg = item["configuration"]
+        subnet_ids = [cfg.get("subnetId")]
+        for rel in item["relationships"]:
+            if rel.get("resourceType") == "AWS::EC2::Subnet":
+                subnet_ids.append(rel.get("resourceId"))
+        for sid in dict.fromkeys(subnet_ids):
+            if sid:
+                self.instances_by_subnet[sid].append(item)
+
+    @classmethod
+    def parse_many(cls, snapshot_paths: Iterable[str],
+                   workers: int | None = None) -> "AWSConfigParser":
+        """Parse several snapshot files (e.g. one per region) into one parser.
+
+        Each file is parsed in its own worker process; results are merged in
+        the given order, so a later file wins on duplicate resource ids.
+
+        Args:
+            snapshot_paths: Snapshot JSON file paths.
+            workers: Max worker processes (default: CPU count).
+
+        Returns:
+            AWSConfigParser holding the resources of all files.
+        """
+        paths = list(snapshot_paths)
+        if not paths:
+            raise ValueError("parse_many() requires at least one snapshot path")
+        if len(paths) == 1:
+            return cls(paths[0])
+
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parsers = list(pool.map(cls, paths))
+
+        merged = parsers[0]
+        for other in parsers[1:]:
+            merged._merge(other)
+        return merged
+
+    def _merge(self, other: "AWSConfigParser") -> None:
+        """Append another parser's resources and indexes to this one.
+
+        Resources whose id also appears in ``other`` are replaced, not
+        duplicated: the earlier item is dropped from by_type and
+        instances_by_subnet before the other parser's items are appended.
+        """
+        replaced = self.by_id.keys() & other.by_id.keys()
+        if replaced:
+            for items in self.by_type.values():
+                items[:] = [it for it in items
+                            if it.get("resourceId", "") not in replaced]
+            for sid in list(self.instances_by_subnet):
+                kept = [it for it in self.instances_by_subnet[sid]
+                        if it.get("resourceId", "") not in replaced]
+                if kept:
+                    self.instances_by_subnet[sid] = kept
+                else:
+                    del self.instances_by_subnet[sid]
+        for rt, items in other.by_type.items():
+            self.by_type[rt].extend(items)
+        self.by_id.update(other.by_id)
+        for sid, items in other.instances_by_subnet.items():
+            self.instances_by_subnet[sid].extend(items)
+        # Derived groupings are rebuilt lazily from the merged data
+        self._cache = {}
 
     @staticmethod
     def _normalize_ip_ranges(ip_ranges):
@@ -211,44 +664,92 @@ class AWSConfigParser:
                 result.append(item)
         return result
 
+    @staticmethod
+    def _item_cidr(item: dict, cfg: dict) -> str:
+        """Return a VPC/Subnet CIDR from the first source that has one.
+
+        configuration.cidrBlock is the common case and returns immediately;
+        supplementaryConfiguration (cidrBlock, then cidrBlockAssociationSet)
+        and a CIDR-looking resourceName are only consulted when it is empty.
+        """
+        cidr = cfg.get("cidrBlock", "")
+        if cidr:
+            return cidr
+        # Some snapshots store CIDR in supplementaryConfiguration
+        supp = item.get("supplementaryConfiguration", {})
+        if isinstance(supp, dict):
+            cidr = supp.get("cidrBlock", "")
+            if cidr:
+                return cidr
+            assocs = supp.get("cidrBlockAssociationSet", [])
+            if isinstance(assocs, str):
+                try:
+                    assocs = json.loads(assocs)
+                except Exception:
+                    assocs = []
+            for a in assocs:
+                if isinstance(a, dict):
+                    cb = a.get("cidrBlock", "")
+                    if cb:
+                        return cb
+        # resourceName sometimes contains CIDR
+        rn = item.get("resourceName", "")
+        if "/" in rn:
+            return rn
+        return cidr
+
+    @_memoized
     def get_vpcs(self):
         vpcs = []
         for item in self.by_type["AWS::EC2::VPC"]:
-            cfg = item.get("configuration", {})
-            if not isinstance(cfg, dict):
-                cfg = {}
-            cidr = cfg.get("cidrBlock", "")
-            if not cidr:
-                # Try supplementaryConfiguration
-                supp = item.get("supplementaryConfiguration", {})
-                if isinstance(supp, dict):
-                    cidr = supp.get("cidrBlock", "")
-                    if not cidr:
-                        assocs = supp.get("cidrBlockAssociationSet", [])
-                        if isinstance(assocs, str):
-                            try:
-                                assocs = json.loads(assocs)
-                            except Exception:
-                                assocs = []
-                        for a in assocs:
-                            if isinstance(a, dict):
-                                cb = a.get("cidrBlock", "")
-                                if cb:
-                                    cidr = cb
-                                    break
-            if not cidr:
-                rn = item.get("resourceName", "")
-                if "/" in rn:
-                    cidr = rn
+            cfg = item["configuration"]
+            cidr = self._item_cidr(item, cfg)
             vpcs.append({
                 "id": item["resourceId"],
-                "name": item.get("tags", {}).get("Name", item["resourceId"]),
+                "name": item["_display_name"],
                 "cidr": cidr,
                 "region": item.get("awsRegion", ""),
                 "is_default": cfg.get("isDefault", False),
             })
         return vpcs
 
+    @_memoized
+    def _route_target_kinds(self) -> dict[str, str]:
+        """Map every route gatewayId / natGatewayId to its id prefix.
+
+        "igw-0abc" -> "igw", "nat-0def" -> "nat". Built once over all route
+        tables so the route loops do a dict lookup instead of prefix tests.
+        """
+        kinds = {}
+        for item in self.by_type["AWS::EC2::RouteTable"]:
+            cfg = item["configuration"]
+            for r in cfg.get("routes", []):
+                for key in ("gatewayId", "natGatewayId"):
+                    gw = r.get(key)
+                    if gw and gw not in kinds:
+                        head, sep, _ = gw.partition("-")
+                        kinds[gw] = head if sep else ""
+        return kinds
+
+    @staticmethod
+    def _classify_routes(routes: list[dict], gw_kinds: dict[str, str]) -> str:
+        """Return the subnet tier implied by a route table's routes.
+
+        Public: 0.0.0.0/0 -> IGW (wins immediately)
+        Private: 0.0.0.0/0 -> NAT GW or any other target
+        Isolated: no 0.0.0.0/0 route
+        """
+        has_default = False
+        for r in routes:
+            dest = r.get("destinationCidrBlock", "")
+            if dest != "0.0.0.0/0":
+                continue
+            if gw_kinds.get(r.get("gatewayId")) == "igw":
+                return "Public"
+            has_default = True
+        return "Private" if has_default else "Isolated"
+
+    @_memoized
     def _build_subnet_tier_map(self, vpc_id):
         """Build subnet->tier map using route table analysis + heuristics.
 
@@ -264,43 +765,16 @@ class AWSConfigParser:
         - mapPublicIpOnLaunch -> Public
         """
         subnet_tier = {}
+        gw_kinds = self._route_target_kinds()
 
         # --- Source 1: Route Table analysis ---
-        for item in self.by_type["AWS::EC2::RouteTable"]:
-            cfg = item.get("configuration", {})
-            if not isinstance(cfg, dict):
-                cfg = {}
-            rt_vpc = cfg.get("vpcId", "")
-            if not rt_vpc:
-                rt_vpc = self._get_related_vpc(item)
-            if rt_vpc != vpc_id:
-                continue
-            routes = cfg.get("routes", cfg.get("routeSet", []))
-            has_igw = False
-            has_nat = False
-            has_default = False
-            for r in routes:
-                dest = r.get("destinationCidrBlock",
-                             r.get("destinationCidr", ""))
-                if dest == "0.0.0.0/0":
-                    has_default = True
-                    gw = r.get("gatewayId", "")
-                    nat = r.get("natGatewayId", "")
-                    if gw and gw.startswith("igw-"):
-                        has_igw = True
-                    elif nat and nat.startswith("nat-"):
-                        has_nat = True
-
-            if has_igw:
-                tier = "Public"
-            elif has_nat or has_default:
-                tier = "Private"
-            else:
-                tier = "Isolated"
+        for item in self.resources_in_vpc(vpc_id, "AWS::EC2::RouteTable"):
+            cfg = item["configuration"]
+            tier = self._classify_routes(
+                cfg.get("routes", []), gw_kinds)
 
             # Map associated subnets
-            assocs = cfg.get("associations",
-                             cfg.get("routeTableAssociationSet", []))
+            assocs = cfg.get("associations", [])
             for a in assocs:
                 sid = a.get("subnetId", "")
                 if sid:
@@ -321,18 +795,14 @@ class AWSConfigParser:
         # Try direct subnet mapping from service configurations
         # NAT Gateway subnet -> Public (NAT GW resides in a Public subnet)
         for item in self.by_type["AWS::EC2::NatGateway"]:
-            cfg = item.get("configuration", {})
-            if not isinstance(cfg, dict):
-                cfg = {}
+            cfg = item["configuration"]
             sub = cfg.get("subnetId", "")
             if sub and sub in vpc_subnet_ids and sub not in subnet_tier:
                 subnet_tier[sub] = "Public"
 
         # ALB (internet-facing) subnets -> Public
         for item in self.by_type["AWS::ElasticLoadBalancingV2::LoadBalancer"]:
-            cfg = item.get("configuration", {})
-            if not isinstance(cfg, dict):
-                cfg = {}
+            cfg = item["configuration"]
             scheme = cfg.get("scheme", "")
             if scheme == "internet-facing":
                 for az in cfg.get("availabilityZones", []):
@@ -342,10 +812,8 @@ class AWSConfigParser:
 
         # RDS subnets -> Isolated
         for item in self.by_type["AWS::RDS::DBInstance"]:
-            cfg = item.get("configuration", {})
-            if not isinstance(cfg, dict):
-                cfg = {}
-            sg_group = cfg.get("dBSubnetGroup", cfg.get("dbSubnetGroup", {}))
+            cfg = item["configuration"]
+            sg_group = cfg.get("dBSubnetGroup", {})
             if not isinstance(sg_group, dict):
                 sg_group = {}
             for s in sg_group.get("subnets", []):
@@ -368,31 +836,31 @@ class AWSConfigParser:
         has_nat = bool(self.by_type["AWS::EC2::NatGateway"])
         has_rds = bool(self.by_type["AWS::RDS::DBInstance"])
 
-        # Group VPC subnets by AZ
-        az_subnets = defaultdict(list)
+        # Find subnets that have EC2 instances (these are Private/app subnets)
+        ec2_subnets = set()
+        for item in self.by_type["AWS::EC2::Instance"]:
+            cfg_e = item["configuration"]
+            sub = cfg_e.get("subnetId", "")
+            if sub and sub in vpc_subnet_ids:
+                ec2_subnets.add(sub)
+
+        # Group VPC subnets by AZ in one pass: (all, without EC2, with EC2)
+        az_subnets = {}
         for item in self.by_type["AWS::EC2::Subnet"]:
             sid = item["resourceId"]
             if sid not in vpc_subnet_ids:
                 continue
-            az = ""
-            cfg_s = item.get("configuration", {})
-            if isinstance(cfg_s, dict):
-                az = cfg_s.get("availabilityZone", "")
+            cfg_s = item["configuration"]
+            az = cfg_s.get("availabilityZone", "")
             if not az:
                 az = item.get("availabilityZone", "")
-            az_subnets[az or "unknown"].append(sid)
-
-        # Find subnets that have EC2 instances (these are Private/app subnets)
-        ec2_subnets = set()
-        for item in self.by_type["AWS::EC2::Instance"]:
-            cfg_e = item.get("configuration", {})
-            if isinstance(cfg_e, dict):
-                sub = cfg_e.get("subnetId", "")
-                if sub and sub in vpc_subnet_ids:
-                    ec2_subnets.add(sub)
+            sids, non_ec2, with_ec2 = az_subnets.setdefault(
+                az or "unknown", ([], [], []))
+            sids.append(sid)
+            (with_ec2 if sid in ec2_subnets else non_ec2).append(sid)
 
         # Distribute: for each AZ, assign tiers to subnets
-        for az, sids in az_subnets.items():
+        for az, (sids, non_ec2, with_ec2) in az_subnets.items():
             if len(sids) == 1:
                 # Only 1 subnet in this AZ: make it Private (most useful)
                 subnet_tier[sids[0]] = "Private"
@@ -400,8 +868,6 @@ class AWSConfigParser:
                 # 2 subnets: Public + Private
                 if has_igw or has_nat:
                     # The one WITHOUT EC2 is likely Public
-                    non_ec2 = [s for s in sids if s not in ec2_subnets]
-                    with_ec2 = [s for s in sids if s in ec2_subnets]
                     if non_ec2 and with_ec2:
                         subnet_tier[non_ec2[0]] = "Public"
                         subnet_tier[with_ec2[0]] = "Private"
@@ -413,8 +879,6 @@ class AWSConfigParser:
                     subnet_tier[sids[1]] = "Private"
             else:
                 # 3+ subnets: Public + Private + Isolated
-                non_ec2 = [s for s in sids if s not in ec2_subnets]
-                with_ec2 = [s for s in sids if s in ec2_subnets]
                 assigned = set()
 
                 # First non-EC2 subnet -> Public
@@ -452,12 +916,68 @@ class AWSConfigParser:
 
     @staticmethod
     def _get_related_vpc(item):
-        """Extract VPC ID from relationships when configuration is empty."""
-        for rel in item.get("relationships", []):
-            if rel.get("resourceType") == "AWS::EC2::VPC":
-                return rel.get("resourceId", "")
-        return ""
+        """Extract VPC ID from relationships when configuration is empty.
+
+        Stored on the item as "_related_vpc" after the first scan, since the
+        reverse-map builders ask for the same items repeatedly.
+        """
+        vpc = item.get("_related_vpc")
+        if vpc is None:
+            vpc = ""
+            for rel in item["relationships"]:
+                if rel.get("resourceType") == "AWS::EC2::VPC":
+                    vpc = rel.get("resourceId", "")
+                    break
+            item["_related_vpc"] = vpc
+        return vpc
+
+    # Types indexed by _resources_by_vpc. IGW / NAT / RDS / ALB often lack a
+    # vpcId and are placed via their _build_*_vpc_map reverse map instead.
+    VPC_SCOPED_TYPES = (
+        "AWS::EC2::RouteTable",
+        "AWS::EC2::SecurityGroup",
+        "AWS::EC2::InternetGateway",
+        "AWS::EC2::NatGateway",
+        "AWS::RDS::DBInstance",
+        "AWS::ElasticLoadBalancingV2::LoadBalancer",
+    )
+
+    @_memoized
+    def _resources_by_vpc(self) -> dict[str, dict[str, list[dict]]]:
+        """Index VPC_SCOPED_TYPES items as {vpc_id: {resource_type: [items]}}.
+
+        Built in a single pass on first use, preserving snapshot order.
+        """
+        reverse_maps = {
+            "AWS::EC2::InternetGateway": self._build_igw_vpc_map(),
+            "AWS::EC2::NatGateway": self._build_nat_vpc_map(),
+            "AWS::RDS::DBInstance": self._build_rds_vpc_map(),
+            "AWS::ElasticLoadBalancingV2::LoadBalancer": self._build_alb_vpc_map(),
+        }
+        index = {}
+        for resource_type in self.VPC_SCOPED_TYPES:
+            vpc_map = reverse_maps.get(resource_type)
+            for item in self.by_type[resource_type]:
+                if vpc_map is not None:
+                    item_vpc = vpc_map.get(item["resourceId"])
+                else:
+                    item_vpc = item["configuration"].get("vpcId", "")
+                    if not item_vpc:
+                        item_vpc = self._get_related_vpc(item)
+                index.setdefault(item_vpc, {}).setdefault(
+                    resource_type, []).append(item)
+        return index
+
+    def resources_in_vpc(self, vpc_id: str, resource_type: str) -> list[dict]:
+        """Return items of resource_type (one of VPC_SCOPED_TYPES) in vpc_id.
+
+        Route tables and security groups are matched by configuration.vpcId,
+        falling back to the relationships → VPC reference; IGW / NAT / RDS /
+        ALB use the comprehensive _build_*_vpc_map reverse maps.
+        """
+        return self._resources_by_vpc().get(vpc_id, {}).get(resource_type, [])
 
+    @_memoized
     def _build_subnet_vpc_map(self):
         """Build subnet_id -> vpc_id map from all available sources.
 
@@ -469,8 +989,8 @@ class AWSConfigParser:
 
         # Source 1: Subnet configuration itself
         for item in self.by_type["AWS::EC2::Subnet"]:
-            cfg = item.get("configuration", {})
-            if isinstance(cfg, dict) and cfg.get("vpcId"):
+            cfg = item["configuration"]
+            if cfg.get("vpcId"):
                 s2v[item["resourceId"]] = cfg["vpcId"]
 
         # Source 2: Subnet relationships
@@ -483,45 +1003,39 @@ class AWSConfigParser:
 
         # Source 3: EC2 instances (subnetId + vpcId in config)
         for item in self.by_type["AWS::EC2::Instance"]:
-            cfg = item.get("configuration", {})
-            if isinstance(cfg, dict):
-                sub = cfg.get("subnetId", "")
-                vpc = cfg.get("vpcId", "")
-                if sub and vpc and sub not in s2v:
-                    s2v[sub] = vpc
+            cfg = item["configuration"]
+            sub = cfg.get("subnetId", "")
+            vpc = cfg.get("vpcId", "")
+            if sub and vpc and sub not in s2v:
+                s2v[sub] = vpc
 
         # Source 4: NAT Gateways
         for item in self.by_type["AWS::EC2::NatGateway"]:
-            cfg = item.get("configuration", {})
-            if isinstance(cfg, dict):
-                sub = cfg.get("subnetId", "")
-                vpc = cfg.get("vpcId", "")
-                if sub and vpc and sub not in s2v:
-                    s2v[sub] = vpc
+            cfg = item["configuration"]
+            sub = cfg.get("subnetId", "")
+            vpc = cfg.get("vpcId", "")
+            if sub and vpc and sub not in s2v:
+                s2v[sub] = vpc
 
         # Source 5: ALB availability zones
         for item in self.by_type["AWS::ElasticLoadBalancingV2::LoadBalancer"]:
-            cfg = item.get("configuration", {})
-            if isinstance(cfg, dict):
-                vpc = cfg.get("vpcId", "")
-                if vpc:
-                    for az in cfg.get("availabilityZones", []):
-                        sub = az.get("subnetId", "")
-                        if sub and sub not in s2v:
-                            s2v[sub] = vpc
+            cfg = item["configuration"]
+            vpc = cfg.get("vpcId", "")
+            if vpc:
+                for az in cfg.get("availabilityZones", []):
+                    sub = az.get("subnetId", "")
+                    if sub and sub not in s2v:
+                        s2v[sub] = vpc
 
         # Source 6: Route Table associations (subnetId in associations)
         for item in self.by_type["AWS::EC2::RouteTable"]:
-            cfg = item.get("configuration", {})
-            if not isinstance(cfg, dict):
-                continue
+            cfg = item["configuration"]
             rt_vpc = cfg.get("vpcId", "")
             if not rt_vpc:
                 rt_vpc = self._get_related_vpc(item)
             if not rt_vpc:
                 continue
-            assocs = cfg.get("associations",
-                             cfg.get("routeTableAssociationSet", []))
+            assocs = cfg.get("associations", [])
             for a in assocs:
                 sid = a.get("subnetId", "")
                 if sid and sid not in s2v:
@@ -529,6 +1043,7 @@ class AWSConfigParser:
 
         return s2v
 
+    @_memoized
     def _get_primary_vpc_id(self):
         """Get the primary (non-default, most-resourced) VPC ID.
 
@@ -542,8 +1057,8 @@ class AWSConfigParser:
             vpc_counts[vid] += 1
         # Also count EC2 instances per VPC
         for item in self.by_type["AWS::EC2::Instance"]:
-            cfg = item.get("configuration", {})
-            if isinstance(cfg, dict) and cfg.get("vpcId"):
+            cfg = item["configuration"]
+            if cfg.get("vpcId"):
                 vpc_counts[cfg["vpcId"]] += 10
 
         if vpc_counts:
@@ -551,13 +1066,14 @@ class AWSConfigParser:
 
         # Fallback: first non-default VPC, or just first VPC
         for item in self.by_type["AWS::EC2::VPC"]:
-            cfg = item.get("configuration", {})
+            cfg = item["configuration"]
             if not cfg.get("isDefault", False):
                 return item["resourceId"]
         if self.by_type["AWS::EC2::VPC"]:
             return self.by_type["AWS::EC2::VPC"][0]["resourceId"]
         return ""
 
+    @_memoized
     def _build_igw_vpc_map(self):
         """Build igw_id -> vpc_id map from Route Tables.
 
@@ -569,9 +1085,7 @@ class AWSConfigParser:
 
         # Source 1: IGW configuration.attachments
         for item in self.by_type["AWS::EC2::InternetGateway"]:
-            cfg = item.get("configuration", {})
-            if not isinstance(cfg, dict):
-                cfg = {}
+            cfg = item["configuration"]
             for att in cfg.get("attachments", []):
                 vid = att.get("vpcId", "")
                 if vid:
@@ -583,19 +1097,18 @@ class AWSConfigParser:
                     igw2vpc[item["resourceId"]] = rel_vpc
 
         # Source 3: Route Tables (routes contain gatewayId = igw-xxx)
+        gw_kinds = self._route_target_kinds()
         for item in self.by_type["AWS::EC2::RouteTable"]:
-            cfg = item.get("configuration", {})
-            if not isinstance(cfg, dict):
-                continue
+            cfg = item["configuration"]
             rt_vpc = cfg.get("vpcId", "")
             if not rt_vpc:
                 rt_vpc = self._get_related_vpc(item)
             if not rt_vpc:
                 continue
-            routes = cfg.get("routes", cfg.get("routeSet", []))
+            routes = cfg.get("routes", [])
             for r in routes:
                 gw = r.get("gatewayId", "")
-                if gw and gw.startswith("igw-") and gw not in igw2vpc:
+                if gw_kinds.get(gw) == "igw" and gw not in igw2vpc:
                     igw2vpc[gw] = rt_vpc
 
         # Source 4 (last resort): Assign unmatched IGWs to primary VPC
@@ -614,6 +1127,7 @@ class AWSConfigParser:
 
         return igw2vpc
 
+    @_memoized
     def _build_nat_vpc_map(self):
         """Build nat_id -> vpc_id map from Route Tables and NAT config.
 
@@ -625,9 +1139,7 @@ class AWSConfigParser:
 
         # Source 1: NAT configuration.vpcId
         for item in self.by_type["AWS::EC2::NatGateway"]:
-            cfg = item.get("configuration", {})
-            if not isinstance(cfg, dict):
-                cfg = {}
+            cfg = item["configuration"]
             vid = cfg.get("vpcId", "")
             if vid:
                 nat2vpc[item["resourceId"]] = vid
@@ -635,19 +1147,18 @@ class AWSConfigParser:
                 nat2vpc[item["resourceId"]] = self._get_related_vpc(item)
 
         # Source 2: Route Tables (routes contain natGatewayId = nat-xxx)
+        gw_kinds = self._route_target_kinds()
         for item in self.by_type["AWS::EC2::RouteTable"]:
-            cfg = item.get("configuration", {})
-            if not isinstance(cfg, dict):
-                continue
+            cfg = item["configuration"]
             rt_vpc = cfg.get("vpcId", "")
             if not rt_vpc:
                 rt_vpc = self._get_related_vpc(item)
             if not rt_vpc:
                 continue
-            routes = cfg.get("routes", cfg.get("routeSet", []))
+            routes = cfg.get("routes", [])
             for r in routes:
                 nat = r.get("natGatewayId", "")
-                if nat and nat.startswith("nat-") and nat not in nat2vpc:
+                if gw_kinds.get(nat) == "nat" and nat not in nat2vpc:
                     nat2vpc[nat] = rt_vpc
 
         # Source 3 (last resort): Assign unmatched NATs to primary VPC
@@ -661,6 +1172,7 @@ class AWSConfigParser:
 
         return nat2vpc
 
+    @_memoized
     def _build_rds_vpc_map(self):
         """Build rds_id -> vpc_id map by matching RDS subnet IDs to known subnets.
 
@@ -671,13 +1183,11 @@ class AWSConfigParser:
         s2v = self._build_subnet_vpc_map()
 
         for item in self.by_type["AWS::RDS::DBInstance"]:
-            cfg = item.get("configuration", {})
-            if not isinstance(cfg, dict):
-                cfg = {}
+            cfg = item["configuration"]
             rid = item["resourceId"]
 
             # Source 1: dBSubnetGroup.vpcId
-            sg_group = cfg.get("dBSubnetGroup", cfg.get("dbSubnetGroup", {}))
+            sg_group = cfg.get("dBSubnetGroup", {})
             if not isinstance(sg_group, dict):
                 sg_group = {}
             vid = sg_group.get("vpcId", "")
@@ -710,66 +1220,93 @@ class AWSConfigParser:
 
         return rds2vpc
 
+    @_memoized
+    def _build_alb_vpc_map(self) -> dict[str, str]:
+        """Build alb_id -> vpc_id map (config > relationships > subnets).
+
+        ALBs without a vpcId or VPC relationship are placed by the first of
+        their subnets found in the subnet -> VPC map; "" if none resolves.
+        """
+        s2v = self._build_subnet_vpc_map()
+        alb2vpc = {}
+        for item in self.by_type["AWS::ElasticLoadBalancingV2::LoadBalancer"]:
+            cfg = item["configuration"]
+            item_vpc = cfg.get("vpcId", "")
+            if not item_vpc:
+                item_vpc = self._get_related_vpc(item)
+            # Fallback: match ALB's subnets to known subnet→VPC map
+            if not item_vpc:
+                for az in cfg.get("availabilityZones", []):
+                    sub = az.get("subnetId", "")
+                    if sub and sub in s2v:
+                        item_vpc = s2v[sub]
+                        break
+            alb2vpc[item["resourceId"]] = item_vpc
+        return alb2vpc
+
+    @_memoized
     def _build_subnet_cidr_map(self):
         """Build subnet -> CIDR map from NetworkInterface configurations.
 
         When Subnet configuration is ResourceNotRecorded, we can infer
         the subnet CIDR from NetworkInterface privateIpAddress + subnetId.
         This is a heuristic — we collect all private IPs per subnet and
-        try to guess the CIDR from the common prefix.
+        take the common bit prefix, never narrower than /24 or wider than /16.
         """
-        subnet_ips = defaultdict(list)
-        for item in self.by_type.get("AWS::EC2::NetworkInterface", []):
-            cfg = item.get("configuration", {})
-            if not isinstance(cfg, dict):
-                cfg = {}
+        # Sets: the same IP appears on an ENI and its instance. Order doesn't
+        # matter since every address shares the prefix that is kept.
+        subnet_ips = defaultdict(set)
+        for item in self.by_type["AWS::EC2::NetworkInterface"]:
+            cfg = item["configuration"]
             sub_id = cfg.get("subnetId", "")
             if not sub_id:
                 continue
+            ips = subnet_ips[sub_id]
             # Collect private IPs
             priv_addrs = cfg.get("privateIpAddresses", [])
             for pa in priv_addrs:
                 if isinstance(pa, dict):
                     ip = pa.get("privateIpAddress", "")
                     if ip:
-                        subnet_ips[sub_id].append(ip)
+                        ips.add(ip)
             # Also try top-level privateIpAddress
             pip = cfg.get("privateIpAddress", "")
-            if pip and pip not in subnet_ips[sub_id]:
-                subnet_ips[sub_id].append(pip)
+            if pip:
+                ips.add(pip)
 
         # Also collect from EC2 instances
-        for item in self.by_type.get("AWS::EC2::Instance", []):
-            cfg = item.get("configuration", {})
-            if not isinstance(cfg, dict):
-                cfg = {}
+        for item in self.by_type["AWS::EC2::Instance"]:
+            cfg = item["configuration"]
             sub_id = cfg.get("subnetId", "")
             pip = cfg.get("privateIpAddress", "")
             if sub_id and pip:
-                if pip not in subnet_ips[sub_id]:
-                    subnet_ips[sub_id].append(pip)
+                subnet_ips[sub_id].add(pip)
 
-        # Try to guess CIDR from collected IPs
+        # Guess CIDR from the common bit prefix of the collected IPs
         cidr_map = {}
         for sub_id, ips in subnet_ips.items():
-            if ips:
-                # Use first IP as representative; guess /24 as common default
-                ip = ips[0]
-                parts = ip.split(".")
-                if len(parts) == 4:
-                    cidr_map[sub_id] = f"{parts[0]}.{parts[1]}.{parts[2]}.0/24"
+            addrs = [n for n in map(_ipv4_to_int, ips) if n is not None]
+            if not addrs:
+                continue
+            # Few IPs seen -> assume the common /24 default; AWS caps at /16
+            prefix = max(16, min(24, _common_prefix_len(addrs)))
+            mask = (0xFFFFFFFF << (32 - prefix)) & 0xFFFFFFFF
+            cidr_map[sub_id] = f"{_int_to_ipv4(addrs[0] & mask)}/{prefix}"
         return cidr_map
 
-    def get_subnets_for_vpc(self, vpc_id):
-        tier_map = self._build_subnet_tier_map(vpc_id)
-        default_tier = tier_map.get("_main", "Private")
+    @_memoized
+    def _subnet_index(self) -> dict[str, list[tuple]]:
+        """Resolve each subnet's VPC, AZ and CIDR once, grouped by VPC.
+
+        Returns {vpc_id: [(item, subnet_id, az, cidr), ...]} in snapshot
+        order. Only the tier depends on the VPC being drawn, so that part
+        stays in get_subnets_for_vpc.
+        """
         subnet_vpc_map = self._build_subnet_vpc_map()
         subnet_cidr_map = self._build_subnet_cidr_map()
-        subnets = []
+        index = defaultdict(list)
         for item in self.by_type["AWS::EC2::Subnet"]:
-            cfg = item.get("configuration", {})
-            if not isinstance(cfg, dict):
-                cfg = {}
+            cfg = item["configuration"]
             sid = item["resourceId"]
 
             # VPC ID: configuration > relationships > reverse-engineered map
@@ -779,48 +1316,29 @@ class AWSConfigParser:
             if not item_vpc:
                 item_vpc = subnet_vpc_map.get(sid, "")
 
-            if item_vpc != vpc_id:
-                continue
-
-            tags = item.get("tags", {})
-            sid = item["resourceId"]
-
             # AZ: try configuration, fallback to top-level field
             az = cfg.get("availabilityZone", "")
             if not az:
                 az = item.get("availabilityZone", "")
 
-            # CIDR: try multiple sources
-            cidr = cfg.get("cidrBlock", "")
-            if not cidr:
-                # Try supplementaryConfiguration
-                supp = item.get("supplementaryConfiguration", {})
-                if isinstance(supp, dict):
-                    # Some snapshots store CIDR in supplementaryConfiguration
-                    cidr = supp.get("cidrBlock", "")
-                    if not cidr:
-                        # cidrBlockAssociationSet
-                        assocs = supp.get("cidrBlockAssociationSet", [])
-                        if isinstance(assocs, str):
-                            try:
-                                assocs = json.loads(assocs)
-                            except Exception:
-                                assocs = []
-                        for a in assocs:
-                            if isinstance(a, dict):
-                                cb = a.get("cidrBlock", "")
-                                if cb:
-                                    cidr = cb
-                                    break
-            if not cidr:
-                # resourceName sometimes contains CIDR
-                rn = item.get("resourceName", "")
-                if "/" in rn:
-                    cidr = rn
+            # CIDR: configuration > supplementary > resourceName > ENI/EC2 IPs
+            cidr = self._item_cidr(item, cfg)
             if not cidr:
                 # Fallback: infer from NetworkInterface/EC2 IPs
                 cidr = subnet_cidr_map.get(sid, "")
 
+            index[item_vpc].append((item, sid, az, cidr))
+        return index
+
+    @_memoized
+    def get_subnets_for_vpc(self, vpc_id):
+        tier_map = self._build_subnet_tier_map(vpc_id)
+        default_tier = tier_map.get("_main", "Private")
+        subnets = []
+        for item, sid, az, cidr in self._subnet_index().get(vpc_id, []):
+            cfg = item["configuration"]
+            tags = item["tags"]
+
             # Priority: explicit Tier tag > route table > name hint > default
             tier = tags.get("Tier", "")
             if not tier:
@@ -843,43 +1361,37 @@ class AWSConfigParser:
 
             subnets.append({
                 "id": sid,
-                "name": tags.get("Name", sid),
+                "name": item["_display_name"],
                 "cidr": cidr,
                 "az": az,
                 "tier": tier,
             })
         return subnets
 
+    @_memoized
     def get_igw_for_vpc(self, vpc_id):
-        igw_vpc_map = self._build_igw_vpc_map()
-        for item in self.by_type["AWS::EC2::InternetGateway"]:
+        for item in self.resources_in_vpc(vpc_id, "AWS::EC2::InternetGateway"):
             rid = item["resourceId"]
-            # Use comprehensive reverse map (config + relationships + route tables)
-            if igw_vpc_map.get(rid) == vpc_id:
-                return {
-                    "id": rid,
-                    "name": item.get("tags", {}).get("Name", rid),
-                }
+            return {
+                "id": rid,
+                "name": item["_display_name"],
+            }
         return None
 
+    @_memoized
     def get_nat_gateways_for_vpc(self, vpc_id):
-        nat_vpc_map = self._build_nat_vpc_map()
         nats = []
-        for item in self.by_type["AWS::EC2::NatGateway"]:
-            cfg = item.get("configuration", {})
-            if not isinstance(cfg, dict):
-                cfg = {}
+        for item in self.resources_in_vpc(vpc_id, "AWS::EC2::NatGateway"):
+            cfg = item["configuration"]
             rid = item["resourceId"]
-            # Use comprehensive reverse map (config + relationships + route tables)
-            if nat_vpc_map.get(rid) == vpc_id:
-                addrs = cfg.get("natGatewayAddresses", [])
-                public_ip = addrs[0].get("publicIp", "") if addrs else ""
-                nats.append({
-                    "id": rid,
-                    "name": item.get("tags", {}).get("Name", rid),
-                    "subnet_id": cfg.get("subnetId", ""),
-                    "public_ip": public_ip,
-                })
+            addrs = cfg.get("natGatewayAddresses", [])
+            public_ip = addrs[0].get("publicIp", "") if addrs else ""
+            nats.append({
+                "id": rid,
+                "name": item["_display_name"],
+                "subnet_id": cfg.get("subnetId", ""),
+                "public_ip": public_ip,
+            })
         return nats
 
     def get_nat_usage_map(self, vpc_id):
@@ -889,26 +1401,19 @@ class AWSConfigParser:
         戻り値: { "nat-xxx": ["subnet-aaa", "subnet-bbb"], ... }
         """
         nat_to_subnets: dict[str, list[str]] = {}
+        gw_kinds = self._route_target_kinds()
 
-        for item in self.by_type["AWS::EC2::RouteTable"]:
-            cfg = item.get("configuration", {})
-            if not isinstance(cfg, dict):
-                cfg = {}
-            rt_vpc = cfg.get("vpcId", "")
-            if not rt_vpc:
-                rt_vpc = self._get_related_vpc(item)
-            if rt_vpc != vpc_id:
-                continue
+        for item in self.resources_in_vpc(vpc_id, "AWS::EC2::RouteTable"):
+            cfg = item["configuration"]
 
             # ルートから natGatewayId を検出
-            routes = cfg.get("routes", cfg.get("routeSet", []))
+            routes = cfg.get("routes", [])
             nat_id = ""
             for r in routes:
-                dest = r.get("destinationCidrBlock",
-                             r.get("destinationCidr", ""))
+                dest = r.get("destinationCidrBlock", "")
                 if dest == "0.0.0.0/0":
                     n = r.get("natGatewayId", "")
-                    if n and n.startswith("nat-"):
+                    if gw_kinds.get(n) == "nat":
                         nat_id = n
                         break
 
@@ -916,8 +1421,7 @@ class AWSConfigParser:
                 continue
 
             # このルートテーブルに関連付けられた Subnet を収集
-            assocs = cfg.get("associations",
-                             cfg.get("routeTableAssociationSet", []))
+            assocs = cfg.get("associations", [])
             for a in assocs:
                 sid = a.get("subnetId", "")
                 if sid:
@@ -927,124 +1431,138 @@ class AWSConfigParser:
 
         return nat_to_subnets
 
+    @_memoized
+    def _formatted_instances_by_subnet(self) -> dict[str, list[dict]]:
+        """Format every indexed EC2 instance once, keyed like instances_by_subnet.
+
+        An instance listed under several subnets shares one output dict.
+        """
+        formatted = {}
+        by_subnet = {}
+        for sid, items in self.instances_by_subnet.items():
+            rows = by_subnet[sid] = []
+            for item in items:
+                row = formatted.get(id(item))
+                if row is None:
+                    cfg = item["configuration"]
+                    tags = item["tags"]
+                    row = formatted[id(item)] = {
+                        "id": item["resourceId"],
+                        "name": item["_display_name"],
+                        "type": cfg.get("instanceType", ""),
+                        "private_ip": cfg.get("privateIpAddress", ""),
+                        "public_ip": cfg.get("publicIpAddress"),
+                        "role": tags.get("Role", ""),
+                        "sg_ids": [sg.get("groupId", "") for sg in cfg.get("securityGroups", [])],
+                    }
+                rows.append(row)
+        return by_subnet
+
     def get_instances_for_subnet(self, subnet_id):
-        instances = []
-        for item in self.by_type["AWS::EC2::Instance"]:
-            cfg = item.get("configuration", {})
-            if not isinstance(cfg, dict):
-                cfg = {}
-            # Primary: configuration.subnetId
-            matched = cfg.get("subnetId") == subnet_id
-            # Fallback: relationships → Subnet reference
-            if not matched:
-                for rel in item.get("relationships", []):
-                    if (rel.get("resourceType") == "AWS::EC2::Subnet"
-                            and rel.get("resourceId") == subnet_id):
-                        matched = True
-                        break
-            if matched:
-                tags = item.get("tags", {})
-                instances.append({
-                    "id": item["resourceId"],
-                    "name": tags.get("Name", item["resourceId"]),
-                    "type": cfg.get("instanceType", ""),
-                    "private_ip": cfg.get("privateIpAddress", ""),
-                    "public_ip": cfg.get("publicIpAddress"),
-                    "role": tags.get("Role", ""),
-                    "sg_ids": [sg.get("groupId", "") for sg in cfg.get("securityGroups", [])],
-                })
-        return instances
+        return self._formatted_instances_by_subnet().get(subnet_id, [])
 
+    @_memoized
     def get_albs_for_vpc(self, vpc_id):
-        s2v = self._build_subnet_vpc_map()
         albs = []
-        for item in self.by_type["AWS::ElasticLoadBalancingV2::LoadBalancer"]:
-            cfg = item.get("configuration", {})
-            if not isinstance(cfg, dict):
-                cfg = {}
-            item_vpc = cfg.get("vpcId", "")
-            if not item_vpc:
-                item_vpc = self._get_related_vpc(item)
-            # Fallback: match ALB's subnets to known subnet→VPC map
-            if not item_vpc:
-                for az in cfg.get("availabilityZones", []):
-                    sub = az.get("subnetId", "")
-                    if sub and sub in s2v:
-                        item_vpc = s2v[sub]
-                        break
-            if item_vpc == vpc_id:
-                subnet_ids = []
-                for az in cfg.get("availabilityZones", []):
-                    sid = az.get("subnetId", "")
-                    if sid:
-                        subnet_ids.append(sid)
-                albs.append({
-                    "id": item["resourceId"],
-                    "name": cfg.get("loadBalancerName", item.get("tags", {}).get("Name", "")),
-                    "scheme": cfg.get("scheme", ""),
-                    "type": cfg.get("type", ""),
-                    "dns": cfg.get("dNSName", ""),
-                    "subnet_ids": subnet_ids,
-                    "sg_ids": cfg.get("securityGroups", []),
-                })
+        for item in self.resources_in_vpc(
+                vpc_id, "AWS::ElasticLoadBalancingV2::LoadBalancer"):
+            cfg = item["configuration"]
+            subnet_ids = []
+            for az in cfg.get("availabilityZones", []):
+                sid = az.get("subnetId", "")
+                if sid:
+                    subnet_ids.append(sid)
+            albs.append({
+                "id": item["resourceId"],
+                "name": cfg.get("loadBalancerName", item["tags"].get("Name", "")),
+                "scheme": cfg.get("scheme", ""),
+                "type": cfg.get("type", ""),
+                "dns": cfg.get("dNSName", ""),
+                "subnet_ids": subnet_ids,
+                "sg_ids": cfg.get("securityGroups", []),
+            })
         return albs
 
+    @_memoized
     def get_rds_for_vpc(self, vpc_id):
-        rds_vpc_map = self._build_rds_vpc_map()
         dbs = []
-        for item in self.by_type["AWS::RDS::DBInstance"]:
-            cfg = item.get("configuration", {})
-            if not isinstance(cfg, dict):
-                cfg = {}
+        for item in self.resources_in_vpc(vpc_id, "AWS::RDS::DBInstance"):
+            cfg = item["configuration"]
             rid = item["resourceId"]
-            # Use comprehensive reverse map (subnetGroup + relationships + subnet matching)
-            if rds_vpc_map.get(rid) == vpc_id:
-                sg_group = cfg.get("dBSubnetGroup", cfg.get("dbSubnetGroup", {}))
-                if not isinstance(sg_group, dict):
-                    sg_group = {}
-                subnet_ids = [s.get("subnetIdentifier", "") for s in sg_group.get("subnets", [])]
-                dbs.append({
-                    "id": rid,
-                    "name": cfg.get("dBInstanceIdentifier", ""),
-                    "engine": cfg.get("engine", ""),
-                    "instance_class": cfg.get("dBInstanceClass", ""),
-                    "port": cfg.get("endpoint", {}).get("port", ""),
-                    "multi_az": cfg.get("multiAZ", False),
-                    "publicly_accessible": cfg.get("publiclyAccessible", False),
-                    "subnet_ids": subnet_ids,
-                    "sg_ids": [sg.get("vpcSecurityGroupId", "") for sg in cfg.get("vpcSecurityGroups", [])],
-                })
+            sg_group = cfg.get("dBSubnetGroup", {})
+            if not isinstance(sg_group, dict):
+                sg_group = {}
+            subnet_ids = [s.get("subnetIdentifier", "") for s in sg_group.get("subnets", [])]
+            dbs.append({
+                "id": rid,
+                "name": cfg.get("dBInstanceIdentifier", ""),
+                "engine": cfg.get("engine", ""),
+                "instance_class": cfg.get("dBInstanceClass", ""),
+                "port": cfg.get("endpoint", {}).get("port", ""),
+                "multi_az": cfg.get("multiAZ", False),
+                "publicly_accessible": cfg.get("publiclyAccessible", False),
+                "subnet_ids": subnet_ids,
+                "sg_ids": [sg.get("vpcSecurityGroupId", "") for sg in cfg.get("vpcSecurityGroups", [])],
+            })
         return dbs
 
+    @_memoized
     def get_security_groups_for_vpc(self, vpc_id):
+        """Get SGs of a VPC with their raw rules.
+
+        'ingress_peers' / 'egress_peers' hold, per rule and in rule order,
+        the rule's CIDRs followed by its peer groups as 'SG:<id>'.
+        """
         sgs = []
-        for item in self.by_type["AWS::EC2::SecurityGroup"]:
-            cfg = item.get("configuration", {})
-            if not isinstance(cfg, dict):
-                cfg = {}
-            # Primary: configuration.vpcId
-            item_vpc = cfg.get("vpcId", "")
-            # Fallback: relationships → VPC reference
-            if not item_vpc:
-                item_vpc = self._get_related_vpc(item)
-            if item_vpc == vpc_id:
-                sgs.append({
-                    "id": cfg.get("groupId", item["resourceId"]),
-                    "name": cfg.get("groupName", ""),
-                    "description": cfg.get("description", ""),
-                    "ingress": cfg.get("ipPermissions", []),
-                    "egress": cfg.get("ipPermissionsEgress", []),
-                })
+        for item in self.resources_in_vpc(vpc_id, "AWS::EC2::SecurityGroup"):
+            cfg = item["configuration"]
+            ingress = cfg.get("ipPermissions", [])
+            egress = cfg.get("ipPermissionsEgress", [])
+            sgs.append({
+                "id": cfg.get("groupId", item["resourceId"]),
+                "name": cfg.get("groupName", ""),
+                "description": cfg.get("description", ""),
+                "ingress": ingress,
+                "egress": egress,
+                "ingress_peers": [self._rule_peers(r) for r in ingress],
+                "egress_peers": [self._rule_peers(r) for r in egress],
+            })
         return sgs
 
+    @_memoized
+    def get_open_egress_rules(self, vpc_id):
+        """Get egress rules of a VPC's SGs that allow 0.0.0.0/0.
+
+        Returns list of dicts, one per matching IP range in SG/rule order:
+          { "sg_name": str, "from_port": int|str, "description": str }
+        """
+        rules = []
+        for sg in self.get_security_groups_for_vpc(vpc_id):
+            for rule in sg["egress"]:
+                for ipr in self._normalize_ip_ranges(rule.get("ipRanges", [])):
+                    if ipr.get("cidrIp") == "0.0.0.0/0":
+                        rules.append({
+                            "sg_name": sg["name"],
+                            "from_port": rule.get("fromPort", "all"),
+                            "description": ipr.get("description", ""),
+                        })
+        return rules
+
+    @classmethod
+    def _rule_peers(cls, rule: dict) -> list[str]:
+        """Return a rule's CIDRs and 'SG:<groupId>' peers, in that order."""
+        peers = [ipr.get("cidrIp", "")
+                 for ipr in cls._normalize_ip_ranges(rule.get("ipRanges", []))]
+        peers.extend(f"SG:{pair.get('groupId', '')}"
+                     for pair in rule.get("userIdGroupPairs", []))
+        return peers
+
     def get_vpc_endpoints_for_vpc(self, vpc_id):
         """Get VPC Endpoints (Gateway & Interface types) for a VPC."""
         s2v = self._build_subnet_vpc_map()
         endpoints = []
-        for item in self.by_type.get("AWS::EC2::VPCEndpoint", []):
-            cfg = item.get("configuration", {})
-            if not isinstance(cfg, dict):
-                cfg = {}
+        for item in self.by_type["AWS::EC2::VPCEndpoint"]:
+            cfg = item["configuration"]
             item_vpc = cfg.get("vpcId", "")
             if not item_vpc:
                 item_vpc = self._get_related_vpc(item)
@@ -1056,7 +1574,7 @@ class AWSConfigParser:
                         break
             # Fallback: relationships
             if not item_vpc:
-                for rel in item.get("relationships", []):
+                for rel in item["relationships"]:
                     if rel.get("resourceType") == "AWS::EC2::VPC":
                         item_vpc = rel.get("resourceId", "")
                         break
@@ -1076,13 +1594,14 @@ class AWSConfigParser:
             })
         return endpoints
 
+    @_memoized
     def get_peering_connections(self):
         peerings = []
         for item in self.by_type["AWS::EC2::VPCPeeringConnection"]:
-            cfg = item.get("configuration", {})
+            cfg = item["configuration"]
             peerings.append({
                 "id": item["resourceId"],
-                "name": item.get("tags", {}).get("Name", item["resourceId"]),
+                "name": item["_display_name"],
                 "accepter_vpc": cfg.get("accepterVpcInfo", {}).get("vpcId", ""),
                 "requester_vpc": cfg.get("requesterVpcInfo", {}).get("vpcId", ""),
                 "accepter_cidr": cfg.get("accepterVpcInfo", {}).get("cidrBlock", ""),
@@ -1090,45 +1609,81 @@ class AWSConfigParser:
             })
         return peerings
 
-    def get_external_sg_rules(self, vpc_id):
-        """Extract SG rules that allow 0.0.0.0/0 (external access) - audit critical."""
-        external_rules = []
-        for sg in self.get_security_groups_for_vpc(vpc_id):
-            for rule in sg.get("ingress", []):
-                for ip_range in self._normalize_ip_ranges(rule.get("ipRanges", [])):
-                    if ip_range.get("cidrIp") == "0.0.0.0/0":
-                        external_rules.append({
-                            "sg_id": sg["id"],
-                            "sg_name": sg["name"],
-                            "direction": "INBOUND",
-                            "protocol": rule.get("ipProtocol", ""),
-                            "from_port": rule.get("fromPort", ""),
-                            "to_port": rule.get("toPort", ""),
-                            "source": "0.0.0.0/0",
-                            "description": ip_range.get("description", ""),
-                        })
-        return external_rules
+    @_memoized
+    def _build_sg_vpc_map(self) -> dict[str, str]:
+        """Build sg_id (groupId) -> vpc_id map (config > relationships)."""
+        sg2vpc = {}
+        for item in self.by_type["AWS::EC2::SecurityGroup"]:
+            cfg = item["configuration"]
+            item_vpc = cfg.get("vpcId", "")
+            if not item_vpc:
+                item_vpc = self._get_related_vpc(item)
+            sg2vpc[cfg.get("groupId", item["resourceId"])] = item_vpc
+        return sg2vpc
 
-    def get_sg_connections(self):
-        """Extract SG-to-SG references to draw internal traffic flows."""
+    @_memoized
+    def _scan_sg_rules(self) -> tuple[dict[str, list[dict]], list[dict], list[dict]]:
+        """Walk every SG ingress rule once for the three rule-derived views.
+
+        Returns (external_rules_by_vpc, internet_facing, sg_connections) in the
+        shapes returned by get_external_sg_rules / get_internet_facing_sgs /
+        get_sg_connections. External rules are grouped via _build_sg_vpc_map.
+        """
+        sg_vpc = self._build_sg_vpc_map()
+        external_by_vpc = {}
+        internet_facing = []
         connections = []
-        all_sgs = self.by_type["AWS::EC2::SecurityGroup"]
-        for item in all_sgs:
-            cfg = item.get("configuration", {})
+        for item in self.by_type["AWS::EC2::SecurityGroup"]:
+            cfg = item["configuration"]
             sg_id = cfg.get("groupId", item["resourceId"])
             sg_name = cfg.get("groupName", "")
-            # Ingress: who can talk TO this SG
+            item_vpc = sg_vpc.get(sg_id, "")
             for rule in cfg.get("ipPermissions", []):
+                protocol = rule.get("ipProtocol", "")
+                from_port = rule.get("fromPort", "")
+                # Both ['0.0.0.0/0'] and [{'cidrIp': ...}] forms, read in
+                # place rather than via a normalized copy per rule
+                for ip_range in rule.get("ipRanges", []):
+                    if isinstance(ip_range, str):
+                        cidr, description = ip_range, ""
+                    else:
+                        cidr = ip_range.get("cidrIp")
+                        description = ip_range.get("description", "")
+                    if cidr in _OPEN_CIDRS:
+                        external_by_vpc.setdefault(item_vpc, []).append({
+                            "sg_id": sg_id,
+                            "sg_name": sg_name,
+                            "direction": "INBOUND",
+                            "protocol": protocol,
+                            "from_port": from_port,
+                            "to_port": rule.get("toPort", ""),
+                            "source": cidr,
+                            "description": description,
+                        })
+                        internet_facing.append({
+                            "sg_id": sg_id,
+                            "port": from_port,
+                            "protocol": protocol,
+                        })
+                # Ingress: who can talk TO this SG
                 for pair in rule.get("userIdGroupPairs", []):
                     connections.append({
                         "from_sg": pair["groupId"],
                         "to_sg": sg_id,
                         "to_sg_name": sg_name,
-                        "port": rule.get("fromPort", ""),
-                        "protocol": rule.get("ipProtocol", ""),
+                        "port": from_port,
+                        "protocol": protocol,
                         "description": pair.get("description", ""),
                     })
-        return connections
+        return external_by_vpc, internet_facing, connections
+
+    def get_external_sg_rules(self, vpc_id):
+        """Extract SG rules that allow 0.0.0.0/0 (external access) - audit critical."""
+        return self._scan_sg_rules()[0].get(vpc_id, [])
+
+    def get_sg_connections(self):
+        """Extract SG-to-SG references to draw internal traffic flows."""
+        return self._scan_sg_rules()[2]
 
     def get_internet_facing_sgs(self):
         """Return SGs that allow inbound from 0.0.0.0/0 (internet-facing).
@@ -1136,23 +1691,44 @@ class AWSConfigParser:
         Returns list of dicts:
           { "sg_id": str, "port": int|str, "protocol": str }
         """
-        results = []
-        for item in self.by_type["AWS::EC2::SecurityGroup"]:
-            cfg = item.get("configuration", {})
-            sg_id = cfg.get("groupId", item["resourceId"])
-            for rule in cfg.get("ipPermissions", []):
-                ip_ranges = rule.get("ipRanges", [])
-                ip_ranges = self._normalize_ip_ranges(ip_ranges)
-                for ip_range in ip_ranges:
-                    cidr = ip_range.get("cidrIp", "")
-                    if cidr == "0.0.0.0/0":
-                        results.append({
-                            "sg_id": sg_id,
-                            "port": rule.get("fromPort", ""),
-                            "protocol": rule.get("ipProtocol", ""),
-                        })
-        return results
-
+        return self._scan_sg_rules()[1]
+
+    @_memoized
+    def _waf_index(self) -> tuple[dict[str, dict], list[tuple[str, dict]]]:
+        """Build the WAF association index used by get_waf_for_alb.
+
+        Returns:
+            A tuple (by_resource, associations). by_resource maps each
+            associated resource ARN, and every '/'-separated suffix of it,
+            to the first WebACL summary that lists it. associations keeps
+            (resource ARN, summary) pairs in scan order for the substring
+            fallback.
+        """
+        by_resource: dict[str, dict] = {}
+        associations: list[tuple[str, dict]] = []
+        for item in self.by_type["AWS::WAFv2::WebACL"]:
+            cfg = item["configuration"]
+            associated = (cfg.get("associatedResources", [])
+                          + cfg.get("_associated_resources", []))
+            if not associated:
+                continue
+            rules = cfg.get("rules", [])
+            summary = {
+                "id": item["resourceId"],
+                "name": cfg.get("name", ""),
+                "rules_summary": [r.get("name", "") for r in rules[:3]],
+                "rule_count": len(rules),
+            }
+            for res_arn in associated:
+                associations.append((res_arn, summary))
+                by_resource.setdefault(res_arn, summary)
+                tail = res_arn
+                while "/" in tail:
+                    tail = tail.partition("/")[2]
+                    by_resource.setdefault(tail, summary)
+        return by_resource, associations
+
+    @_memoized
     def get_waf_for_alb(self, alb_id_or_arn):
         """Get WAF WebACL associated with an ALB.
 
@@ -1160,34 +1736,25 @@ class AWSConfigParser:
         'associatedResources' and '_associated_resources' keys,
         and also tries partial match for short IDs.
         """
-        for item in self.by_type["AWS::WAFv2::WebACL"]:
-            cfg = item.get("configuration", {})
-            associated = (cfg.get("associatedResources", [])
-                          + cfg.get("_associated_resources", []))
-            # Check exact match or partial (short ALB id in ARN)
-            for res_arn in associated:
-                if (alb_id_or_arn == res_arn
-                        or alb_id_or_arn in res_arn):
-                    rules = cfg.get("rules", [])
-                    rule_names = [r.get("name", "") for r in rules[:3]]
-                    return {
-                        "id": item["resourceId"],
-                        "name": cfg.get("name", ""),
-                        "rules_summary": rule_names,
-                        "rule_count": len(rules),
-                    }
+        by_resource, associations = self._waf_index()
+        waf = by_resource.get(alb_id_or_arn)
+        if waf is not None:
+            return dict(waf)
+        # Partial match (short ALB id somewhere inside the ARN)
+        for res_arn, summary in associations:
+            if alb_id_or_arn in res_arn:
+                return dict(summary)
         return None
 
+    @_memoized
     def get_s3_buckets(self):
         """Get S3 buckets."""
         buckets = []
         for item in self.by_type["AWS::S3::Bucket"]:
-            cfg = item.get("configuration", {})
+            cfg = item["configuration"]
             pub_block = cfg.get("publicAccessBlockConfiguration", {})
-            is_public_blocked = all([
-                pub_block.get("blockPublicAcls", False),
-                pub_block.get("blockPublicPolicy", False),
-            ])
+            is_public_blocked = bool(pub_block.get("blockPublicAcls", False)
+                                     and pub_block.get("blockPublicPolicy", False))
             buckets.append({
                 "id": item["resourceId"],
                 "name": cfg.get("name", item["resourceId"]),
@@ -1202,11 +1769,11 @@ class AWSConfigParser:
     def get_lambda_functions(self):
         funcs = []
         for item in self.by_type["AWS::Lambda::Function"]:
-            cfg = item.get("configuration", {})
+            cfg = item["configuration"]
             vpc_cfg = cfg.get("vpcConfig", {})
             funcs.append({
                 "id": item["resourceId"],
-                "name": cfg.get("functionName", item.get("tags", {}).get("Name", item["resourceId"])),
+                "name": cfg.get("functionName", item["_display_name"]),
                 "runtime": cfg.get("runtime", ""),
                 "memory": cfg.get("memorySize", ""),
                 "timeout": cfg.get("timeout", ""),
@@ -1219,21 +1786,21 @@ class AWSConfigParser:
     def get_ecs_clusters(self):
         clusters = []
         for item in self.by_type["AWS::ECS::Cluster"]:
-            cfg = item.get("configuration", {})
+            cfg = item["configuration"]
             clusters.append({
                 "id": item["resourceId"],
-                "name": cfg.get("clusterName", item.get("tags", {}).get("Name", item["resourceId"])),
+                "name": cfg.get("clusterName", item["_display_name"]),
             })
         return clusters
 
     def get_ecs_services(self):
         services = []
         for item in self.by_type["AWS::ECS::Service"]:
-            cfg = item.get("configuration", {})
+            cfg = item["configuration"]
             net_cfg = cfg.get("networkConfiguration", {}).get("awsvpcConfiguration", {})
             services.append({
                 "id": item["resourceId"],
-                "name": cfg.get("serviceName", item.get("tags", {}).get("Name", item["resourceId"])),
+                "name": cfg.get("serviceName", item["_display_name"]),
                 "cluster_arn": cfg.get("clusterArn", ""),
                 "launch_type": cfg.get("launchType", ""),
                 "desired_count": cfg.get("desiredCount", 0),
@@ -1245,11 +1812,11 @@ class AWSConfigParser:
     def get_eks_clusters(self):
         clusters = []
         for item in self.by_type["AWS::EKS::Cluster"]:
-            cfg = item.get("configuration", {})
+            cfg = item["configuration"]
             vpc_cfg = cfg.get("resourcesVpcConfig", {})
             clusters.append({
                 "id": item["resourceId"],
-                "name": cfg.get("name", item.get("tags", {}).get("Name", item["resourceId"])),
+                "name": cfg.get("name", item["_display_name"]),
                 "version": cfg.get("version", ""),
                 "subnet_ids": vpc_cfg.get("subnetIds", []),
                 "sg_ids": vpc_cfg.get("securityGroupIds", []),
@@ -1259,28 +1826,29 @@ class AWSConfigParser:
     def get_autoscaling_groups(self):
         asgs = []
         for item in self.by_type["AWS::AutoScaling::AutoScalingGroup"]:
-            cfg = item.get("configuration", {})
+            cfg = item["configuration"]
             subnet_str = cfg.get("vPCZoneIdentifier", "")
             asgs.append({
                 "id": item["resourceId"],
-                "name": cfg.get("autoScalingGroupName", item.get("tags", {}).get("Name", item["resourceId"])),
+                "name": cfg.get("autoScalingGroupName", item["_display_name"]),
                 "min_size": cfg.get("minSize", 0),
                 "max_size": cfg.get("maxSize", 0),
                 "desired": cfg.get("desiredCapacity", 0),
-                "subnet_ids": [s for s in subnet_str.split(",") if s] if subnet_str else [],
+                "subnet_ids": list(filter(None, subnet_str.split(","))) if subnet_str else [],
             })
         return asgs
 
+    @_memoized
     def get_cloudfront_distributions(self):
         dists = []
         for item in self.by_type["AWS::CloudFront::Distribution"]:
-            cfg = item.get("configuration", {})
+            cfg = item["configuration"]
             dist_cfg = cfg.get("distributionConfig", cfg)
             origins = dist_cfg.get("origins", {}).get("items", [])
             origin_domains = [o.get("domainName", "") for o in origins]
             dists.append({
                 "id": item["resourceId"],
-                "name": item.get("tags", {}).get("Name", dist_cfg.get("comment", item["resourceId"])),
+                "name": item["tags"].get("Name", dist_cfg.get("comment", item["resourceId"])),
                 "domain_name": cfg.get("domainName", ""),
                 "origin_domains": origin_domains,
                 "waf_id": dist_cfg.get("webACLId", ""),
@@ -1290,17 +1858,17 @@ class AWSConfigParser:
     def get_api_gateways(self):
         apis = []
         for item in self.by_type["AWS::ApiGateway::RestApi"]:
-            cfg = item.get("configuration", {})
+            cfg = item["configuration"]
             apis.append({
                 "id": item["resourceId"],
-                "name": cfg.get("name", item.get("tags", {}).get("Name", item["resourceId"])),
+                "name": cfg.get("name", item["_display_name"]),
                 "type": "REST",
             })
         for item in self.by_type["AWS::ApiGatewayV2::Api"]:
-            cfg = item.get("configuration", {})
+            cfg = item["configuration"]
             apis.append({
                 "id": item["resourceId"],
-                "name": cfg.get("name", item.get("tags", {}).get("Name", item["resourceId"])),
+                "name": cfg.get("name", item["_display_name"]),
                 "type": cfg.get("protocolType", "HTTP"),
             })
         return apis
@@ -1308,10 +1876,10 @@ class AWSConfigParser:
     def get_route53_hosted_zones(self):
         zones = []
         for item in self.by_type["AWS::Route53::HostedZone"]:
-            cfg = item.get("configuration", {})
+            cfg = item["configuration"]
             zones.append({
                 "id": item["resourceId"],
-                "name": cfg.get("name", item.get("tags", {}).get("Name", item["resourceId"])),
+                "name": cfg.get("name", item["_display_name"]),
                 "private": cfg.get("config", {}).get("privateZone", False),
             })
         return zones
@@ -1319,10 +1887,10 @@ class AWSConfigParser:
     def get_dynamodb_tables(self):
         tables = []
         for item in self.by_type["AWS::DynamoDB::Table"]:
-            cfg = item.get("configuration", {})
+            cfg = item["configuration"]
             tables.append({
                 "id": item["resourceId"],
-                "name": cfg.get("tableName", item.get("tags", {}).get("Name", item["resourceId"])),
+                "name": cfg.get("tableName", item["_display_name"]),
                 "status": cfg.get("tableStatus", ""),
             })
         return tables
@@ -1330,11 +1898,11 @@ class AWSConfigParser:
     def get_elasticache_clusters(self):
         clusters = []
         for item in self.by_type["AWS::ElastiCache::CacheCluster"]:
-            cfg = item.get("configuration", {})
+            cfg = item["configuration"]
             sg_ids = [sg.get("securityGroupId", "") for sg in cfg.get("securityGroups", [])]
             clusters.append({
                 "id": item["resourceId"],
-                "name": cfg.get("cacheClusterId", item.get("tags", {}).get("Name", item["resourceId"])),
+                "name": cfg.get("cacheClusterId", item["_display_name"]),
                 "engine": cfg.get("engine", ""),
                 "node_type": cfg.get("cacheNodeType", ""),
                 "sg_ids": sg_ids,
@@ -1344,11 +1912,11 @@ class AWSConfigParser:
     def get_redshift_clusters(self):
         clusters = []
         for item in self.by_type["AWS::Redshift::Cluster"]:
-            cfg = item.get("configuration", {})
+            cfg = item["configuration"]
             sg_ids = [sg.get("vpcSecurityGroupId", "") for sg in cfg.get("vpcSecurityGroups", [])]
             clusters.append({
                 "id": item["resourceId"],
-                "name": cfg.get("clusterIdentifier", item.get("tags", {}).get("Name", item["resourceId"])),
+                "name": cfg.get("clusterIdentifier", item["_display_name"]),
                 "node_type": cfg.get("nodeType", ""),
                 "sg_ids": sg_ids,
             })
@@ -1357,12 +1925,12 @@ class AWSConfigParser:
     def get_sqs_queues(self):
         queues = []
         for item in self.by_type["AWS::SQS::Queue"]:
-            cfg = item.get("configuration", {})
+            cfg = item["configuration"]
             name = cfg.get("queueName", "")
             if not name:
                 # Extract from ARN
                 arn = item.get("arn", "")
-                name = arn.split(":")[-1] if arn else item["resourceId"]
+                name = arn.rpartition(":")[2] if arn else item["resourceId"]
             queues.append({
                 "id": item["resourceId"],
                 "name": name,
@@ -1373,9 +1941,9 @@ class AWSConfigParser:
     def get_sns_topics(self):
         topics = []
         for item in self.by_type["AWS::SNS::Topic"]:
-            cfg = item.get("configuration", {})
-            arn = cfg.get("topicArn", item.get("arn", ""))
-            name = arn.split(":")[-1] if arn else item["resourceId"]
+            cfg = item["configuration"]
+            arn = cfg["topicArn"] if "topicArn" in cfg else item.get("arn", "")
+            name = arn.rpartition(":")[2] if arn else item["resourceId"]
             topics.append({
                 "id": item["resourceId"],
                 "name": name,
@@ -1385,21 +1953,22 @@ class AWSConfigParser:
     def get_kms_keys(self):
         keys = []
         for item in self.by_type["AWS::KMS::Key"]:
-            cfg = item.get("configuration", {})
+            cfg = item["configuration"]
             keys.append({
                 "id": item["resourceId"],
-                "name": cfg.get("description", item.get("tags", {}).get("Name", item["resourceId"])),
+                "name": cfg.get("description", item["_display_name"]),
                 "state": cfg.get("keyState", ""),
             })
         return keys
 
+    @_memoized
     def get_cloudtrail_trails(self):
         trails = []
         for item in self.by_type["AWS::CloudTrail::Trail"]:
-            cfg = item.get("configuration", {})
+            cfg = item["configuration"]
             trails.append({
                 "id": item["resourceId"],
-                "name": cfg.get("name", item.get("tags", {}).get("Name", item["resourceId"])),
+                "name": cfg.get("name", item["_display_name"]),
                 "s3_bucket": cfg.get("s3BucketName", ""),
                 "is_logging": cfg.get("isLogging", False),
             })
@@ -1408,10 +1977,10 @@ class AWSConfigParser:
     def get_cloudwatch_alarms(self):
         alarms = []
         for item in self.by_type["AWS::CloudWatch::Alarm"]:
-            cfg = item.get("configuration", {})
+            cfg = item["configuration"]
             alarms.append({
                 "id": item["resourceId"],
-                "name": cfg.get("alarmName", item.get("tags", {}).get("Name", item["resourceId"])),
+                "name": cfg.get("alarmName", item["_display_name"]),
                 "metric": cfg.get("metricName", ""),
                 "namespace": cfg.get("namespace", ""),
             })
@@ -1420,38 +1989,60 @@ class AWSConfigParser:
     def get_elasticbeanstalk_environments(self):
         envs = []
         for item in self.by_type["AWS::ElasticBeanstalk::Environment"]:
-            cfg = item.get("configuration", {})
+            cfg = item["configuration"]
             envs.append({
                 "id": item["resourceId"],
-                "name": cfg.get("environmentName", item.get("tags", {}).get("Name", item["resourceId"])),
+                "name": cfg.get("environmentName", item["_display_name"]),
                 "app_name": cfg.get("applicationName", ""),
                 "status": cfg.get("status", ""),
             })
         return envs
 
-    def get_service_connections(self):
-        """Infer connections for services that don't use Security Groups."""
-        connections = []
-
-        # CloudFront -> ALB/S3 (origin domains)
+    @_memoized
+    def _alb_dns_map(self) -> dict[str, str]:
+        """Map lower-cased ALB DNS name -> ALB resource id."""
         alb_dns_map = {}
         for item in self.by_type["AWS::ElasticLoadBalancingV2::LoadBalancer"]:
-            cfg = item.get("configuration", {})
+            cfg = item["configuration"]
             dns = cfg.get("dNSName", "")
             if dns:
                 alb_dns_map[dns.lower()] = item["resourceId"]
+        return alb_dns_map
+
+    @staticmethod
+    def _match_alb_origin(origin: str, alb_dns_map: dict[str, str]) -> list[str]:
+        """Return ALB ids whose DNS name matches a CloudFront origin host.
 
+        The origin is usually the ALB DNS name itself, optionally with a
+        prefix label (e.g. "dualstack."), so the host and its dot-suffixes are
+        probed in the map first. Only if none hits is the substring scan used.
+        """
+        host = origin
+        while host:
+            alb_id = alb_dns_map.get(host)
+            if alb_id is not None:
+                return [alb_id]
+            host = host.partition(".")[2]
+        return [alb_id for dns, alb_id in alb_dns_map.items()
+                if dns in origin or origin in dns]
+
+    @_memoized
+    def get_service_connections(self):
+        """Infer connections for services that don't use Security Groups."""
+        connections = []
+
+        # CloudFront -> ALB/S3 (origin domains)
+        alb_dns_map = self._alb_dns_map()
         for dist in self.get_cloudfront_distributions():
             for origin in dist.get("origin_domains", []):
                 origin_l = origin.lower()
                 if "elb.amazonaws.com" in origin_l:
-                    for dns, alb_id in alb_dns_map.items():
-                        if dns in origin_l or origin_l in dns:
-                            connections.append({
-                                "from_type": "cloudfront", "from_id": dist["id"],
-                                "to_type": "alb", "to_id": alb_id,
-                                "label": "HTTPS",
-                            })
+                    for alb_id in self._match_alb_origin(origin_l, alb_dns_map):
+                        connections.append({
+                            "from_type": "cloudfront", "from_id": dist["id"],
+                            "to_type": "alb", "to_id": alb_id,
+                            "label": "HTTPS",
+                        })
                 elif "s3" in origin_l:
                     connections.append({
                         "from_type": "cloudfront", "from_id": dist["id"],
@@ -1470,25 +2061,28 @@ class AWSConfigParser:
 
         return connections
 
+    @_memoized
     def build_sg_to_resources_map(self):
-        """Build mapping: sg_id -> list of (resource_type, resource_id, resource_name)."""
+        """Build mapping: sg_id -> list of (resource_type, resource_id, resource_name).
+
+        Computed once per parser; callers only read it via .get().
+        """
         sg_map = defaultdict(list)
 
         # EC2 instances
         for item in self.by_type["AWS::EC2::Instance"]:
-            cfg = item.get("configuration", {})
-            tags = item.get("tags", {})
+            cfg = item["configuration"]
             for sg in cfg.get("securityGroups", []):
                 sg_map[sg["groupId"]].append({
                     "type": "EC2",
                     "id": item["resourceId"],
-                    "name": tags.get("Name", item["resourceId"]),
+                    "name": item["_display_name"],
                     "prefix": "ec2_",
                 })
 
         # ALBs
         for item in self.by_type["AWS::ElasticLoadBalancingV2::LoadBalancer"]:
-            cfg = item.get("configuration", {})
+            cfg = item["configuration"]
             for sg_id in cfg.get("securityGroups", []):
                 sg_map[sg_id].append({
                     "type": "ALB",
@@ -1499,7 +2093,7 @@ class AWSConfigParser:
 
         # RDS
         for item in self.by_type["AWS::RDS::DBInstance"]:
-            cfg = item.get("configuration", {})
+            cfg = item["configuration"]
             for sg in cfg.get("vpcSecurityGroups", []):
                 sg_map[sg["vpcSecurityGroupId"]].append({
                     "type": "RDS",
@@ -1510,7 +2104,7 @@ class AWSConfigParser:
 
         # Lambda (VPC-attached only)
         for item in self.by_type["AWS::Lambda::Function"]:
-            cfg = item.get("configuration", {})
+            cfg = item["configuration"]
             vpc_cfg = cfg.get("vpcConfig", {})
             for sg_id in vpc_cfg.get("securityGroupIds", []):
                 sg_map[sg_id].append({
@@ -1522,7 +2116,7 @@ class AWSConfigParser:
 
         # ECS Services (awsvpc)
         for item in self.by_type["AWS::ECS::Service"]:
-            cfg = item.get("configuration", {})
+            cfg = item["configuration"]
             net_cfg = cfg.get("networkConfiguration", {}).get("awsvpcConfiguration", {})
             for sg_id in net_cfg.get("securityGroups", []):
                 sg_map[sg_id].append({
@@ -1534,7 +2128,7 @@ class AWSConfigParser:
 
         # EKS
         for item in self.by_type["AWS::EKS::Cluster"]:
-            cfg = item.get("configuration", {})
+            cfg = item["configuration"]
             vpc_cfg = cfg.get("resourcesVpcConfig", {})
             for sg_id in vpc_cfg.get("securityGroupIds", []):
                 sg_map[sg_id].append({
@@ -1546,7 +2140,7 @@ class AWSConfigParser:
 
         # ElastiCache
         for item in self.by_type["AWS::ElastiCache::CacheCluster"]:
-            cfg = item.get("configuration", {})
+            cfg = item["configuration"]
             for sg in cfg.get("securityGroups", []):
                 sg_map[sg.get("securityGroupId", "")].append({
                     "type": "ElastiCache",
@@ -1557,7 +2151,7 @@ class AWSConfigParser:
 
         # Redshift
         for item in self.by_type["AWS::Redshift::Cluster"]:
-            cfg = item.get("configuration", {})
+            cfg = item["configuration"]
             for sg in cfg.get("vpcSecurityGroups", []):
                 sg_map[sg.get("vpcSecurityGroupId", "")].append({
                     "type": "Redshift",
@@ -1566,7 +2160,7 @@ class AWSConfigParser:
                     "prefix": "redshift_",
                 })
 
-        return sg_map
+        return dict(sg_map)
 
 
 # ============================================================
@@ -1576,15 +2170,20 @@ class DiagramGenerator:
     """Generate PowerPoint network diagram from parsed AWS Config data."""
 
     def __init__(self, parser: AWSConfigParser):
+        _lazy_pptx()
         self.parser = parser
         self.prs = Presentation()
         # Widescreen 16:9
-        self.prs.slide_width = Inches(13.333)
-        self.prs.slide_height = Inches(7.5)
+        self.prs.slide_width = IN[13.333]
+        self.prs.slide_height = IN[7.5]
 
         # Layout tracking
         self.shape_positions = {}  # resource_id -> (center_x, center_y)
 
+        # Style key -> fully styled p:sp with its text removed, copied for
+        # every later shape of the same style (see _clone_prototype)
+        self._prototypes = {}
+
     def generate(self, output_path):
         """Main generation entry point."""
         vpcs = self.parser.get_vpcs()
@@ -1602,85 +2201,93 @@ class DiagramGenerator:
         self.prs.save(output_path)
         print(f"Diagram saved: {output_path}")
 
+    def _new_slide(self):
+        """Append a blank slide set up for bulk shape insertion.
+
+        Turbo-add makes python-pptx hand out shape ids from a counter
+        instead of scanning every existing id on each add, which is
+        quadratic on dense slides. The returned Slide must be the only
+        object used to add shapes to that slide.
+        """
+        slide = self.prs.slides.add_slide(self.prs.slide_layouts[6])  # blank
+        slide.shapes.turbo_add_enabled = True
+        return slide
+
     # ----------------------------------------------------------
     # Slide 1: Overview
     # ----------------------------------------------------------
     def _create_overview_slide(self, vpcs, peerings):
-        slide = self.prs.slides.add_slide(self.prs.slide_layouts[6])  # blank
+        slide = self._new_slide()
 
         # Title
-        self._add_text_box(slide, Inches(0.3), Inches(0.15), Inches(10), Inches(0.5),
+        self._add_text_box(slide, IN[0.3], IN[0.15], IN[10], IN[0.5],
                            "AWS Network Architecture - External Audit Overview",
                            font_size=20, bold=True)
 
         # ---- Internet (top center) ----
-        inet_x, inet_y = Inches(4.8), Inches(0.7)
-        inet_w, inet_h = Inches(2.0), Inches(0.5)
+        inet_x, inet_y = IN[4.8], IN[0.7]
+        inet_w, inet_h = IN[2.0], IN[0.5]
         self._add_rounded_rect(slide, inet_x, inet_y, inet_w, inet_h,
-                                "Internet", Colors.INTERNET_FILL, Colors.INTERNET_BORDER,
+                                "Internet", PALETTE.INTERNET_FILL, PALETTE.INTERNET_BORDER,
                                 font_size=11, bold=True)
         self.shape_positions["internet"] = (int(inet_x + inet_w / 2), int(inet_y + inet_h / 2))
 
         # ---- WAF (between Internet and VPC) ----
-        waf_drawn = False
-        # Find ALBs to check for WAF association
-        for vpc in vpcs:
-            for alb in self.parser.get_albs_for_vpc(vpc["id"]):
-                waf = self.parser.get_waf_for_alb(alb["id"])
-                if waf:
-                    waf_x, waf_y = Inches(4.5), Inches(1.35)
-                    waf_w, waf_h = Inches(2.6), Inches(0.55)
-                    rules_text = f"WAF: {waf['name']}\nRules: {waf['rule_count']}"
-                    self._add_rounded_rect(slide, waf_x, waf_y, waf_w, waf_h,
-                                            rules_text, Colors.WAF_FILL, Colors.WAF_BORDER,
-                                            font_size=8, bold=True)
-                    self.shape_positions["waf"] = (int(waf_x + waf_w / 2), int(waf_y + waf_h / 2))
-
-                    # Internet -> WAF arrow
-                    self._add_arrow(slide,
-                                    inet_x + inet_w / 2, inet_y + inet_h,
-                                    waf_x + waf_w / 2, waf_y,
-                                    Colors.ARROW_EXTERNAL, width=Pt(2.5),
-                                    label=":443 / :80")
-                    waf_drawn = True
-                    break
-            if waf_drawn:
-                break
+        # First WAF associated with any ALB
+        waf = next((found for vpc in vpcs
+                    for alb in self.parser.get_albs_for_vpc(vpc["id"])
+                    if (found := self.parser.get_waf_for_alb(alb["id"]))), None)
+        waf_drawn = waf is not None
+        if waf_drawn:
+            waf_x, waf_y = IN[4.5], IN[1.35]
+            waf_w, waf_h = IN[2.6], IN[0.55]
+            rules_text = f"WAF: {waf['name']}\nRules: {waf['rule_count']}"
+            self._add_rounded_rect(slide, waf_x, waf_y, waf_w, waf_h,
+                                    rules_text, PALETTE.WAF_FILL, PALETTE.WAF_BORDER,
+                                    font_size=8, bold=True)
+            self.shape_positions["waf"] = (int(waf_x + waf_w / 2), int(waf_y + waf_h / 2))
+
+            # Internet -> WAF arrow
+            self._add_arrow(slide,
+                            inet_x + inet_w / 2, inet_y + inet_h,
+                            waf_x + waf_w / 2, waf_y,
+                            PALETTE.ARROW_EXTERNAL, width=PT[2.5],
+                            label=":443 / :80")
 
         # ---- S3 (right side, outside VPC) ----
         s3_buckets = self.parser.get_s3_buckets()
         if s3_buckets:
-            s3_x, s3_y = Inches(11.3), Inches(3.5)
-            s3_w, s3_h = Inches(1.7), Inches(1.0)
+            s3_x, s3_y = IN[11.3], IN[3.5]
+            s3_w, s3_h = IN[1.7], IN[1.0]
             s3_texts = []
             for b in s3_buckets:
                 enc = "KMS" if b["encrypted"] else "None"
                 s3_texts.append(f"S3: {b['name']}\nEnc: {enc}\nVer: {b['versioning']}")
             s3_label = "\n".join(s3_texts)
             self._add_rounded_rect(slide, s3_x, s3_y, s3_w, s3_h,
-                                    s3_label, Colors.S3_FILL, Colors.S3_BORDER,
+                                    s3_label, PALETTE.S3_FILL, PALETTE.S3_BORDER,
                                     font_size=7, bold=False)
             self.shape_positions["s3"] = (int(s3_x + s3_w / 2), int(s3_y + s3_h / 2))
 
         # ---- VPCs ----
-        vpc_start_y = Inches(2.1)
-        vpc_gap = Inches(0.4)
+        vpc_start_y = IN[2.1]
+        vpc_gap = IN[0.4]
         # Reserve right side for S3 if present
-        total_vpc_width = Inches(10.7) if s3_buckets else Inches(12.5)
+        total_vpc_width = IN[10.7] if s3_buckets else IN[12.5]
 
         if len(vpcs) == 1:
             vpc_width = total_vpc_width
-            vpc_positions = [(Inches(0.4), vpc_start_y)]
+            vpc_positions = [(IN[0.4], vpc_start_y)]
         else:
             vpc_width = (total_vpc_width - vpc_gap * (len(vpcs) - 1)) / len(vpcs)
             vpc_positions = []
             for i in range(len(vpcs)):
-                x = Inches(0.4) + i * (vpc_width + vpc_gap)
+                x = IN[0.4] + i * (vpc_width + vpc_gap)
                 vpc_positions.append((x, vpc_start_y))
 
         for i, vpc in enumerate(vpcs):
             vx, vy = vpc_positions[i]
-            self._draw_vpc(slide, vpc, vx, vy, vpc_width, Inches(5.2))
+            self._draw_vpc(slide, vpc, vx, vy, vpc_width, IN[5.2])
 
         # ---- Peering connections ----
         for peer in peerings:
@@ -1696,59 +2303,58 @@ class DiagramGenerator:
                     if waf_drawn and "waf" in self.shape_positions:
                         # WAF -> IGW arrow
                         wx, wy = self.shape_positions["waf"]
-                        self._add_arrow(slide, wx, wy + Inches(0.28),
-                                        sx, sy - Inches(0.28),
-                                        Colors.ARROW_EXTERNAL, width=Pt(2))
+                        self._add_arrow(slide, wx, wy + IN[0.28],
+                                        sx, sy - IN[0.28],
+                                        PALETTE.ARROW_EXTERNAL, width=PT[2])
                     else:
                         # Direct IGW -> Internet
                         ex, ey = self.shape_positions["internet"]
-                        self._add_arrow(slide, sx, sy - Inches(0.15),
-                                        ex, ey + Inches(0.3),
-                                        Colors.ARROW_EXTERNAL, width=Pt(2.5),
+                        self._add_arrow(slide, sx, sy - IN[0.15],
+                                        ex, ey + IN[0.3],
+                                        PALETTE.ARROW_EXTERNAL, width=PT[2.5],
                                         label=":443 / :80")
 
         # ---- Internal traffic arrows (SG based) ----
         self._draw_traffic_arrows(slide)
 
-        # ---- NAT -> Internet outbound arrow ----
+        # ---- NAT -> Internet outbound arrows; first App server per VPC ----
+        positions = self.shape_positions
+        want_s3 = bool(s3_buckets) and "s3" in positions
+        app_positions = []
         for vpc in vpcs:
             for nat in self.parser.get_nat_gateways_for_vpc(vpc["id"]):
                 nat_key = f"nat_{nat['id']}"
-                if nat_key in self.shape_positions:
-                    nx, ny = self.shape_positions[nat_key]
-                    ix, iy = self.shape_positions["internet"]
-                    self._add_arrow(slide, nx, ny - Inches(0.28),
-                                    ix + Inches(0.8), iy + Inches(0.25),
-                                    RGBColor(0xFF, 0x8F, 0x00), width=Pt(1.5),
+                if nat_key in positions:
+                    nx, ny = positions[nat_key]
+                    ix, iy = positions["internet"]
+                    self._add_arrow(slide, nx, ny - IN[0.28],
+                                    ix + IN[0.8], iy + IN[0.25],
+                                    PALETTE.ARROW_NAT, width=PT[1.5],
                                     label="Outbound :443")
-
-        # ---- App -> S3 arrow ----
-        if s3_buckets and "s3" in self.shape_positions:
-            # Find any App server to draw arrow from
-            for vpc in vpcs:
-                subnets = self.parser.get_subnets_for_vpc(vpc["id"])
-                for sub in subnets:
-                    instances = self.parser.get_instances_for_subnet(sub["id"])
-                    for inst in instances:
-                        if inst.get("role") == "AppServer":
-                            app_key = f"ec2_{inst['id']}"
-                            if app_key in self.shape_positions:
-                                ax, ay = self.shape_positions[app_key]
-                                s3x, s3y = self.shape_positions["s3"]
-                                self._add_arrow(slide,
-                                                ax + Inches(0.75), ay,
-                                                s3x - Inches(0.1), s3y,
-                                                Colors.S3_BORDER, width=Pt(1.5),
-                                                label="S3 API :443")
-                                break  # one arrow is enough
-                    else:
-                        continue
-                    break
+            if want_s3:
+                app_pos = next(
+                    (positions[app_key]
+                     for sub in self.parser.get_subnets_for_vpc(vpc["id"])
+                     for inst in self.parser.get_instances_for_subnet(sub["id"])
+                     if inst.get("role") == "AppServer"
+                     and (app_key := f"ec2_{inst['id']}") in positions),
+                    None)
+                if app_pos is not None:
+                    app_positions.append(app_pos)
+
+        # ---- App -> S3 arrow (one per VPC) ----
+        for ax, ay in app_positions:
+            s3x, s3y = positions["s3"]
+            self._add_arrow(slide,
+                            ax + IN[0.75], ay,
+                            s3x - IN[0.1], s3y,
+                            PALETTE.S3_BORDER, width=PT[1.5],
+                            label="S3 API :443")
 
         # ---- Legend ----
-        legend_x = Inches(0.3) if s3_buckets else Inches(10.5)
-        legend_y = Inches(0.15) if s3_buckets else Inches(0.15)
-        self._add_legend(slide, Inches(10.5), Inches(0.15))
+        legend_x = IN[0.3] if s3_buckets else IN[10.5]
+        legend_y = IN[0.15] if s3_buckets else IN[0.15]
+        self._add_legend(slide, IN[10.5], IN[0.15])
 
     def _draw_vpc(self, slide, vpc, x, y, w, h):
         """Draw a VPC with AZ-column layout. Traffic flows top→bottom, left→right.
@@ -1762,14 +2368,14 @@ class DiagramGenerator:
         # VPC box
         self._add_rounded_rect(
             slide, x, y, w, h,
-            "", Colors.VPC_FILL, Colors.VPC_BORDER, font_size=10)
+            "", PALETTE.VPC_FILL, PALETTE.VPC_BORDER, font_size=10)
 
         # VPC header
         header = f"VPC: {vpc['name']}  |  {vpc['cidr']}  |  {vpc['region']}"
-        self._add_text_box(slide, x + Inches(0.15), y + Inches(0.05),
-                           w - Inches(0.3), Inches(0.35),
+        self._add_text_box(slide, x + IN[0.15], y + IN[0.05],
+                           w - IN[0.3], IN[0.35],
                            header, font_size=9, bold=True,
-                           color=Colors.VPC_BORDER)
+                           color=PALETTE.VPC_BORDER)
 
         # ---- Collect all data ----
         subnets = self.parser.get_subnets_for_vpc(vpc["id"])
@@ -1778,10 +2384,11 @@ class DiagramGenerator:
         albs = self.parser.get_albs_for_vpc(vpc["id"])
         rds_list = self.parser.get_rds_for_vpc(vpc["id"])
 
-        # Group subnets by tier
-        tiers = defaultdict(list)
+        # Group subnets by tier (drawn tiers preallocated, Tier tags may add others)
+        tier_order = ["Public", "Private", "Isolated"]
+        tiers = {t: [] for t in tier_order}
         for s in subnets:
-            tiers[s["tier"]].append(s)
+            tiers.setdefault(s["tier"], []).append(s)
 
         # Discover AZ columns from subnets
         az_set = sorted(set(s["az"] for s in subnets if s["az"]))
@@ -1790,54 +2397,68 @@ class DiagramGenerator:
         num_az = len(az_set)
         az_index = {az: i for i, az in enumerate(az_set)}
 
+        # Bucket subnets by (tier, AZ column) so each column is a direct lookup
+        az_buckets = defaultdict(list)
+        for s in subnets:
+            az_buckets[(s["tier"], az_index.get(s["az"], 0))].append(s)
+
         # ---- Layout dimensions ----
-        margin = Inches(0.12)
-        tier_order = ["Public", "Private", "Isolated"]
-        active_tiers = [t for t in tier_order if t in tiers]
+        margin = IN[0.12]
+        active_tiers = [t for t in tier_order if tiers[t]]
         tier_count = len(active_tiers)
         if tier_count == 0:
             return
 
         # Reserve left column for infra (IGW, NAT) — visible in all tiers
-        infra_col_w = Inches(1.5)
+        infra_col_w = IN[1.5]
         has_infra = bool(igw or nats)
 
         # Tier area (inner content area of VPC)
         tier_area_x = x + margin
-        tier_area_y = y + Inches(0.42)
+        tier_area_y = y + IN[0.42]
         tier_area_w = w - margin * 2
-        tier_area_h = h - Inches(0.52)
+        tier_area_h = h - IN[0.52]
 
-        tier_gap = Inches(0.08)
+        tier_gap = IN[0.08]
         tier_h = (tier_area_h - tier_gap * (tier_count - 1)) / tier_count
 
         # AZ column area (right of infra column)
         if has_infra:
-            az_area_x = tier_area_x + infra_col_w + Inches(0.08)
-            az_area_w = tier_area_w - infra_col_w - Inches(0.08)
+            az_area_x = tier_area_x + infra_col_w + IN[0.08]
+            az_area_w = tier_area_w - infra_col_w - IN[0.08]
         else:
-            az_area_x = tier_area_x + Inches(0.1)
-            az_area_w = tier_area_w - Inches(0.2)
+            az_area_x = tier_area_x + IN[0.1]
+            az_area_w = tier_area_w - IN[0.2]
 
-        az_col_gap = Inches(0.15)
+        az_col_gap = IN[0.15]
         az_col_w = int((az_area_w - az_col_gap * (num_az - 1)) / num_az) if num_az > 0 else az_area_w
 
-        res_w = min(Inches(1.9), int(az_col_w - Inches(0.15)))
-        res_h = Inches(0.6)
+        res_w = min(IN[1.9], int(az_col_w - IN[0.15]))
+        res_h = IN[0.6]
         # Wider resource box for cross-AZ (ALB, RDS)
-        cross_az_w = min(Inches(2.4), int(az_area_w - Inches(0.2)))
+        cross_az_w = min(IN[2.4], int(az_area_w - IN[0.2]))
+
+        # Left edge and centered-resource x of each AZ column
+        col_xs = [int(az_area_x + i * (az_col_w + az_col_gap)) for i in range(num_az)]
+        res_xs = [int(col_x + az_col_w / 2 - res_w / 2) for col_x in col_xs]
 
         # ---- AZ column headers ----
-        for i, az in enumerate(az_set):
+        for az, hdr_x in zip(az_set, col_xs):
             az_short = az.split("-")[-1] if "-" in az else az  # e.g. "1a"
-            hdr_x = int(az_area_x + i * (az_col_w + az_col_gap))
-            self._add_text_box(slide, hdr_x, tier_area_y - Inches(0.02),
-                               az_col_w, Inches(0.2),
+            self._add_text_box(slide, hdr_x, tier_area_y - IN[0.02],
+                               az_col_w, IN[0.2],
                                f"AZ: {az_short}", font_size=7, bold=True,
-                               color=Colors.TEXT_GRAY, align=PP_ALIGN.CENTER)
+                               color=PALETTE.TEXT_GRAY, align=PP_ALIGN.CENTER)
+
+        # Locals for the per-instance loop below
+        instances_for = self.parser.get_instances_for_subnet
+        add_rect = self._add_rounded_rect
+        positions = self.shape_positions
+        ec2_fill, ec2_border = PALETTE.EC2_FILL, PALETTE.EC2_BORDER
+        res_step = res_h + IN[0.06]
 
         # ---- Draw each tier ----
-        current_y = tier_area_y + Inches(0.15)
+        current_y = tier_area_y + IN[0.15]
 
         for tier in active_tiers:
             tier_subnets = tiers[tier]
@@ -1854,36 +2475,36 @@ class DiagramGenerator:
             if tier == "Public":
                 tier_label += "  [EXTERNAL FACING]"
             self._add_text_box(
-                slide, tier_area_x + Inches(0.08), current_y + Inches(0.02),
-                tier_area_w - Inches(0.2), Inches(0.2),
+                slide, tier_area_x + IN[0.08], current_y + IN[0.02],
+                tier_area_w - IN[0.2], IN[0.2],
                 tier_label, font_size=7, bold=True, color=border)
 
-            res_start_y = current_y + Inches(0.28)
+            res_start_y = current_y + IN[0.28]
 
             # ---- Infrastructure column (left, only in Public tier) ----
             if tier == "Public" and has_infra:
                 infra_y = res_start_y
-                infra_x = int(tier_area_x + Inches(0.08))
-                infra_item_w = int(infra_col_w - Inches(0.16))
+                infra_x = int(tier_area_x + IN[0.08])
+                infra_item_w = int(infra_col_w - IN[0.16])
 
                 if igw:
                     self._add_rounded_rect(
-                        slide, infra_x, infra_y, infra_item_w, Inches(0.45),
-                        f"IGW\n{igw['name']}", Colors.IGW_FILL, Colors.IGW_BORDER,
+                        slide, infra_x, infra_y, infra_item_w, IN[0.45],
+                        f"IGW\n{igw['name']}", PALETTE.IGW_FILL, PALETTE.IGW_BORDER,
                         font_size=7, bold=True)
                     self.shape_positions[f"igw_{igw['id']}"] = (
-                        int(infra_x + infra_item_w / 2), int(infra_y + Inches(0.225)))
-                    infra_y += Inches(0.52)
+                        int(infra_x + infra_item_w / 2), int(infra_y + IN[0.225]))
+                    infra_y += IN[0.52]
 
                 for nat in nats:
                     label = f"NAT GW\n{nat['public_ip']}"
                     self._add_rounded_rect(
-                        slide, infra_x, infra_y, infra_item_w, Inches(0.45),
-                        label, Colors.NAT_FILL, Colors.NAT_BORDER,
+                        slide, infra_x, infra_y, infra_item_w, IN[0.45],
+                        label, PALETTE.NAT_FILL, PALETTE.NAT_BORDER,
                         font_size=7, bold=True)
                     self.shape_positions[f"nat_{nat['id']}"] = (
-                        int(infra_x + infra_item_w / 2), int(infra_y + Inches(0.225)))
-                    infra_y += Inches(0.52)
+                        int(infra_x + infra_item_w / 2), int(infra_y + IN[0.225]))
+                    infra_y += IN[0.52]
 
             # ---- Cross-AZ resources (ALB, RDS) - centered in AZ area ----
             cross_az_items = []  # (label, rid, fill, border, prefix)
@@ -1893,16 +2514,16 @@ class DiagramGenerator:
                     if alb["scheme"] == "internet-facing":
                         label = f"ALB: {alb['name']}  (internet-facing, spans AZs)"
                         cross_az_items.append((label, alb["id"],
-                                               Colors.ALB_FILL, Colors.ALB_BORDER, "alb_"))
+                                               PALETTE.ALB_FILL, PALETTE.ALB_BORDER, "alb_"))
 
-            if tier in ("Isolated", "Private"):
+            if tier in ("Isolated", "Private") and rds_list:
+                tier_subnet_ids = {s["id"] for s in tier_subnets}
                 for db in rds_list:
-                    tier_subnet_ids = {s["id"] for s in tier_subnets}
-                    if tier_subnet_ids & set(db["subnet_ids"]):
+                    if not tier_subnet_ids.isdisjoint(db["subnet_ids"]):
                         multi = " (Multi-AZ)" if db["multi_az"] else ""
                         label = f"RDS {db['engine']}{multi}\n{db['name']}  |  Port: {db['port']}"
                         cross_az_items.append((label, db["id"],
-                                               Colors.RDS_FILL, Colors.RDS_BORDER, "rds_"))
+                                               PALETTE.RDS_FILL, PALETTE.RDS_BORDER, "rds_"))
 
             # Draw cross-AZ items centered
             cross_y = res_start_y
@@ -1913,31 +2534,25 @@ class DiagramGenerator:
                     label, cfill, cborder, font_size=7, bold=True)
                 self.shape_positions[f"{prefix}{rid}"] = (
                     int(cross_center_x + cross_az_w / 2), int(cross_y + res_h / 2))
-                cross_y += res_h + Inches(0.06)
+                cross_y += res_h + IN[0.06]
 
             # ---- AZ-aligned resources (per-AZ EC2 instances) ----
             # Start after cross-AZ items
             per_az_start_y = cross_y if cross_az_items else res_start_y
 
-            for col_idx in range(num_az):
-                col_x = int(az_area_x + col_idx * (az_col_w + az_col_gap))
-                res_center_x = int(col_x + az_col_w / 2 - res_w / 2)
+            for col_idx, res_center_x in enumerate(res_xs):
                 ry = per_az_start_y
 
                 # EC2 instances for this AZ in this tier
-                for sub in tier_subnets:
-                    if az_index.get(sub["az"], 0) != col_idx:
-                        continue
-                    instances = self.parser.get_instances_for_subnet(sub["id"])
-                    for inst in instances:
+                for sub in az_buckets.get((tier, col_idx), ()):
+                    for inst in instances_for(sub["id"]):
                         role = f" ({inst['role']})" if inst['role'] else ""
                         label = f"EC2{role}\n{inst['name']}\n{inst['private_ip']}"
-                        self._add_rounded_rect(
-                            slide, res_center_x, ry, res_w, res_h,
-                            label, Colors.EC2_FILL, Colors.EC2_BORDER, font_size=7)
-                        self.shape_positions[f"ec2_{inst['id']}"] = (
+                        add_rect(slide, res_center_x, ry, res_w, res_h,
+                                 label, ec2_fill, ec2_border, font_size=7)
+                        positions[f"ec2_{inst['id']}"] = (
                             int(res_center_x + res_w / 2), int(ry + res_h / 2))
-                        ry += res_h + Inches(0.06)
+                        ry += res_step
 
             current_y += tier_h + tier_gap
 
@@ -1963,9 +2578,9 @@ class DiagramGenerator:
                 sx = rx + vpc_width
                 ex = ax
 
-            mid_y = ay + Inches(2.5)
+            mid_y = ay + IN[2.5]
             self._add_arrow(slide, sx, mid_y, ex, mid_y,
-                            Colors.ARROW_PEERING, width=Pt(2),
+                            PALETTE.ARROW_PEERING, width=PT[2],
                             label=f"Peering: {peer['name']}")
 
     def _draw_traffic_arrows(self, slide):
@@ -1981,295 +2596,290 @@ class DiagramGenerator:
         sg_connections = self.parser.get_sg_connections()
         sg_resource_map = self.parser.build_sg_to_resources_map()
 
+        # SG id -> [(shape_key, x, y)] of its resources placed on this slide,
+        # resolved once instead of per connection pair
+        positions = self.shape_positions
+        placed = {}
+        for sg_id, resources in sg_resource_map.items():
+            endpoints = []
+            for res in resources:
+                key = f"{res['prefix']}{res['id']}"
+                pos = positions.get(key)
+                if pos is not None:
+                    endpoints.append((key, pos[0], pos[1]))
+            placed[sg_id] = endpoints
+
+        same_col_dx = IN[1.0]
+        v_edge = IN[0.30]  # half shape height, vertical arrows
+        h_edge = IN[0.85]  # half shape width, horizontal arrows
+        color = PALETTE.ARROW_INTERNAL
+        line_w = PT[1.8]
+        add_arrow = self._add_arrow
         drawn = set()
 
         for conn in sg_connections:
-            from_sg = conn["from_sg"]
-            to_sg = conn["to_sg"]
             port = conn.get("port", "")
-
-            from_resources = sg_resource_map.get(from_sg, [])
-            to_resources = sg_resource_map.get(to_sg, [])
-
-            # Build all possible arrows with position info
-            arrows = []
-            for from_res in from_resources:
-                from_key = f"{from_res['prefix']}{from_res['id']}"
-                if from_key not in self.shape_positions:
-                    continue
-                sx, sy = self.shape_positions[from_key]
-
-                for to_res in to_resources:
-                    to_key = f"{to_res['prefix']}{to_res['id']}"
-                    if to_key not in self.shape_positions:
-                        continue
-                    ex, ey = self.shape_positions[to_key]
-
-                    # Classify: same-column (vertical) vs cross-column (diagonal)
-                    x_diff = abs(sx - ex)
-                    is_same_col = x_diff < Inches(1.0)
-
-                    arrows.append({
-                        "from_key": from_key, "to_key": to_key,
-                        "sx": sx, "sy": sy, "ex": ex, "ey": ey,
-                        "same_col": is_same_col,
-                    })
+            label = f":{port}" if port else ""
+            from_ends = placed.get(conn["from_sg"], [])
+            to_ends = placed.get(conn["to_sg"], [])
+
+            # Candidate arrows: (from_key, to_key, sx, sy, ex, ey, same_col)
+            # same_col = vertical (same AZ column) vs diagonal (cross-column)
+            arrows = [
+                (from_key, to_key, sx, sy, ex, ey, abs(sx - ex) < same_col_dx)
+                for from_key, sx, sy in from_ends
+                for to_key, ex, ey in to_ends
+            ]
 
             # If we have same-column arrows, skip cross-column ones
-            has_same_col = any(a["same_col"] for a in arrows)
+            has_same_col = any(arrow[6] for arrow in arrows)
 
-            for arrow in arrows:
+            for from_key, to_key, sx, sy, ex, ey, same_col in arrows:
                 # Skip cross-column if same-column arrows exist
-                if has_same_col and not arrow["same_col"]:
+                if has_same_col and not same_col:
                     continue
 
-                from_key = arrow["from_key"]
-                to_key = arrow["to_key"]
-                arrow_id = f"{from_key}->{to_key}"
+                arrow_id = (from_key, to_key)
                 if arrow_id in drawn:
                     continue
                 drawn.add(arrow_id)
 
-                sx, sy = arrow["sx"], arrow["sy"]
-                ex, ey = arrow["ex"], arrow["ey"]
-
-                color = Colors.ARROW_INTERNAL
-                label = f":{port}" if port else ""
-
                 # Adjust start/end to shape edges
                 if abs(ey - sy) > abs(ex - sx):
                     # Vertical arrow (most common: tier-to-tier)
                     if ey > sy:
-                        sy_adj = sy + Inches(0.30)
-                        ey_adj = ey - Inches(0.30)
+                        sy_adj = sy + v_edge
+                        ey_adj = ey - v_edge
                     else:
-                        sy_adj = sy - Inches(0.30)
-                        ey_adj = ey + Inches(0.30)
-                    self._add_arrow(slide, sx, int(sy_adj), ex, int(ey_adj),
-                                    color, width=Pt(1.8), label=label)
+                        sy_adj = sy - v_edge
+                        ey_adj = ey + v_edge
+                    add_arrow(slide, sx, int(sy_adj), ex, int(ey_adj),
+                              color, width=line_w, label=label)
                 else:
                     # Horizontal or diagonal
                     if ex > sx:
-                        sx_adj = sx + Inches(0.85)
-                        ex_adj = ex - Inches(0.85)
+                        sx_adj = sx + h_edge
+                        ex_adj = ex - h_edge
                     else:
-                        sx_adj = sx - Inches(0.85)
-                        ex_adj = ex + Inches(0.85)
-                    self._add_arrow(slide, int(sx_adj), sy, int(ex_adj), ey,
-                                    color, width=Pt(1.8), label=label)
+                        sx_adj = sx - h_edge
+                        ex_adj = ex + h_edge
+                    add_arrow(slide, int(sx_adj), sy, int(ex_adj), ey,
+                              color, width=line_w, label=label)
 
     # ----------------------------------------------------------
     # Slide 2: Security Group Details
     # ----------------------------------------------------------
     def _create_sg_detail_slide(self, vpcs):
-        slide = self.prs.slides.add_slide(self.prs.slide_layouts[6])
+        slide = self._new_slide()
 
-        self._add_text_box(slide, Inches(0.3), Inches(0.2), Inches(12), Inches(0.5),
+        self._add_text_box(slide, IN[0.3], IN[0.2], IN[12], IN[0.5],
                            "Security Group Rules - External Access Audit",
                            font_size=20, bold=True)
 
-        y = Inches(0.9)
+        y = IN[0.9]
 
         for vpc in vpcs:
             # VPC header
-            self._add_text_box(slide, Inches(0.3), y, Inches(6), Inches(0.35),
+            self._add_text_box(slide, IN[0.3], y, IN[6], IN[0.35],
                                f"VPC: {vpc['name']} ({vpc['cidr']})",
-                               font_size=12, bold=True, color=Colors.VPC_BORDER)
-            y += Inches(0.4)
+                               font_size=12, bold=True, color=PALETTE.VPC_BORDER)
+            y += IN[0.4]
 
             # External rules (0.0.0.0/0) - highlighted in red
             ext_rules = self.parser.get_external_sg_rules(vpc["id"])
             if ext_rules:
-                self._add_text_box(slide, Inches(0.5), y, Inches(6), Inches(0.25),
+                self._add_text_box(slide, IN[0.5], y, IN[6], IN[0.25],
                                    "!! EXTERNAL ACCESS (0.0.0.0/0) !!",
-                                   font_size=10, bold=True, color=Colors.ALERT_RED)
-                y += Inches(0.3)
+                                   font_size=10, bold=True, color=PALETTE.ALERT_RED)
+                y += IN[0.3]
 
-                # Table header
+                # Header + one row per rule, drawn as one table
                 headers = ["SG Name", "Direction", "Port", "Source", "Description"]
-                col_widths = [Inches(2), Inches(1.2), Inches(1), Inches(1.5), Inches(4)]
-                self._draw_table_row(slide, Inches(0.5), y, col_widths, headers,
-                                     bold=True, bg_color=RGBColor(0xFF, 0xCC, 0xCC))
-                y += Inches(0.3)
-
+                col_widths = [IN[2], IN[1.2], IN[1], IN[1.5], IN[4]]
+                rows = [headers]
                 for rule in ext_rules:
                     port_str = str(rule["from_port"])
                     if rule["from_port"] != rule["to_port"]:
                         port_str = f"{rule['from_port']}-{rule['to_port']}"
-                    row = [
+                    rows.append([
                         rule["sg_name"],
                         rule["direction"],
                         port_str,
                         rule["source"],
                         rule["description"],
-                    ]
-                    self._draw_table_row(slide, Inches(0.5), y, col_widths, row,
-                                         bg_color=RGBColor(0xFF, 0xF0, 0xF0))
-                    y += Inches(0.28)
+                    ])
+                styles = ([(PALETTE.TABLE_HEADER_ALERT, None, True)]
+                          + [(PALETTE.TABLE_ROW_ALERT, None, False)] * len(ext_rules))
+                y += self._add_table(slide, IN[0.5], y, col_widths, rows,
+                                     IN[0.28], styles,
+                                     border=PALETTE.TABLE_BORDER)
+                y += IN[0.02]
             else:
-                self._add_text_box(slide, Inches(0.5), y, Inches(6), Inches(0.25),
+                self._add_text_box(slide, IN[0.5], y, IN[6], IN[0.25],
                                    "No external access rules (0.0.0.0/0)",
-                                   font_size=9, color=Colors.TEXT_GRAY)
-                y += Inches(0.3)
+                                   font_size=9, color=PALETTE.TEXT_GRAY)
+                y += IN[0.3]
 
             # All SG rules summary
-            y += Inches(0.1)
-            self._add_text_box(slide, Inches(0.5), y, Inches(6), Inches(0.25),
+            y += IN[0.1]
+            self._add_text_box(slide, IN[0.5], y, IN[6], IN[0.25],
                                "All Security Group Rules:",
                                font_size=10, bold=True)
-            y += Inches(0.3)
+            y += IN[0.3]
 
             sgs = self.parser.get_security_groups_for_vpc(vpc["id"])
             for sg in sgs:
-                self._add_text_box(slide, Inches(0.5), y, Inches(8), Inches(0.22),
+                self._add_text_box(slide, IN[0.5], y, IN[8], IN[0.22],
                                    f"{sg['name']} ({sg['id']}) - {sg['description']}",
                                    font_size=8, bold=True)
-                y += Inches(0.25)
-
-                # Ingress
-                for rule in sg.get("ingress", []):
-                    sources = []
-                    for ipr in AWSConfigParser._normalize_ip_ranges(rule.get("ipRanges", [])):
-                        sources.append(ipr.get("cidrIp", ""))
-                    for pair in rule.get("userIdGroupPairs", []):
-                        sources.append(f"SG:{pair.get('groupId', '')}")
+                y += IN[0.25]
 
+                # Ingress / egress rules, one table row each
+                rows = []
+                styles = []
+                for rule, sources in zip(sg["ingress"], sg["ingress_peers"]):
                     port_str = str(rule.get("fromPort", "all"))
                     src_str = ", ".join(sources) if sources else "N/A"
-                    is_external = any("0.0.0.0/0" in s for s in sources)
-
-                    text = f"  IN  | :{port_str} | from {src_str}"
-                    color = Colors.ALERT_RED if is_external else Colors.TEXT_BLACK
-                    self._add_text_box(slide, Inches(0.7), y, Inches(10), Inches(0.2),
-                                       text, font_size=7, color=color,
-                                       bold=is_external)
-                    y += Inches(0.2)
-
-                # Egress
-                for rule in sg.get("egress", []):
-                    dests = []
-                    for ipr in AWSConfigParser._normalize_ip_ranges(rule.get("ipRanges", [])):
-                        dests.append(ipr.get("cidrIp", ""))
-                    for pair in rule.get("userIdGroupPairs", []):
-                        dests.append(f"SG:{pair.get('groupId', '')}")
+                    is_external = "0.0.0.0/0" in sources
+
+                    rows.append(["IN", f":{port_str}", f"from {src_str}"])
+                    styles.append((None, PALETTE.ALERT_RED if is_external else None,
+                                   is_external))
 
+                for rule, dests in zip(sg["egress"], sg["egress_peers"]):
                     port_str = str(rule.get("fromPort", "all"))
                     dst_str = ", ".join(dests) if dests else "N/A"
 
-                    text = f"  OUT | :{port_str} | to {dst_str}"
-                    self._add_text_box(slide, Inches(0.7), y, Inches(10), Inches(0.2),
-                                       text, font_size=7)
-                    y += Inches(0.2)
+                    rows.append(["OUT", f":{port_str}", f"to {dst_str}"])
+                    styles.append((None, None, False))
 
-                y += Inches(0.1)
+                if rows:
+                    y += self._add_table(slide, IN[0.7], y,
+                                         [IN[0.5], IN[0.8], IN[8.7]],
+                                         rows, IN[0.2], styles)
 
-            y += Inches(0.2)
+                y += IN[0.1]
+
+            y += IN[0.2]
 
     # ----------------------------------------------------------
     # Slide 3: Traffic Flow
     # ----------------------------------------------------------
     def _create_traffic_flow_slide(self, vpcs):
-        slide = self.prs.slides.add_slide(self.prs.slide_layouts[6])
+        slide = self._new_slide()
 
-        self._add_text_box(slide, Inches(0.3), Inches(0.2), Inches(12), Inches(0.5),
+        self._add_text_box(slide, IN[0.3], IN[0.2], IN[12], IN[0.5],
                            "Traffic Flow Summary - External Audit",
                            font_size=20, bold=True)
 
-        # Get SG-to-SG connections
-        connections = self.parser.get_sg_connections()
+        # SG-to-SG connections indexed by source SG for hop lookups
+        conns_from = defaultdict(list)
+        for conn in self.parser.get_sg_connections():
+            conns_from[conn["from_sg"]].append(conn)
 
         # Build a readable flow
-        y = Inches(1.0)
+        y = IN[1.0]
 
         # Inbound flows from Internet
-        self._add_text_box(slide, Inches(0.3), y, Inches(8), Inches(0.35),
+        self._add_text_box(slide, IN[0.3], y, IN[8], IN[0.35],
                            "INBOUND Traffic Flows (Internet -> Internal)",
-                           font_size=14, bold=True, color=Colors.ARROW_EXTERNAL)
-        y += Inches(0.5)
+                           font_size=14, bold=True, color=PALETTE.ARROW_EXTERNAL)
+        y += IN[0.5]
 
         for vpc in vpcs:
             ext_rules = self.parser.get_external_sg_rules(vpc["id"])
             if ext_rules:
-                self._add_text_box(slide, Inches(0.5), y, Inches(8), Inches(0.25),
+                self._add_text_box(slide, IN[0.5], y, IN[8], IN[0.25],
                                    f"VPC: {vpc['name']}", font_size=11, bold=True)
-                y += Inches(0.35)
+                y += IN[0.35]
 
                 # Trace the chain: Internet -> ALB (SG with 0.0.0.0/0) -> Web -> DB
                 for rule in ext_rules:
                     text = f"Internet -> :{rule['from_port']} -> {rule['sg_name']}"
-                    self._add_text_box(slide, Inches(0.7), y, Inches(10), Inches(0.22),
-                                       text, font_size=9, color=Colors.ALERT_RED)
-                    y += Inches(0.25)
+                    self._add_text_box(slide, IN[0.7], y, IN[10], IN[0.22],
+                                       text, font_size=9, color=PALETTE.ALERT_RED)
+                    y += IN[0.25]
 
                     # Follow egress from this SG
-                    for conn in connections:
-                        if conn["from_sg"] == rule["sg_id"]:
-                            text2 = f"    -> :{conn['port']} -> {conn['to_sg_name']} ({conn['description']})"
-                            self._add_text_box(slide, Inches(0.7), y, Inches(10), Inches(0.22),
-                                               text2, font_size=9)
-                            y += Inches(0.25)
-
-                            # Follow next hop
-                            for conn2 in connections:
-                                if conn2["from_sg"] == conn["to_sg"]:
-                                    text3 = f"        -> :{conn2['port']} -> {conn2['to_sg_name']} ({conn2['description']})"
-                                    self._add_text_box(slide, Inches(0.7), y, Inches(10), Inches(0.22),
-                                                       text3, font_size=9)
-                                    y += Inches(0.25)
-
-        y += Inches(0.3)
+                    for conn in conns_from.get(rule["sg_id"], ()):
+                        text2 = f"    -> :{conn['port']} -> {conn['to_sg_name']} ({conn['description']})"
+                        self._add_text_box(slide, IN[0.7], y, IN[10], IN[0.22],
+                                           text2, font_size=9)
+                        y += IN[0.25]
+
+                        # Follow next hop
+                        for conn2 in conns_from.get(conn["to_sg"], ()):
+                            text3 = f"        -> :{conn2['port']} -> {conn2['to_sg_name']} ({conn2['description']})"
+                            self._add_text_box(slide, IN[0.7], y, IN[10], IN[0.22],
+                                               text3, font_size=9)
+                            y += IN[0.25]
+
+        y += IN[0.3]
 
         # VPC Peering
         peerings = self.parser.get_peering_connections()
         if peerings:
-            self._add_text_box(slide, Inches(0.3), y, Inches(8), Inches(0.35),
+            self._add_text_box(slide, IN[0.3], y, IN[8], IN[0.35],
                                "VPC Peering Connections",
-                               font_size=14, bold=True, color=Colors.ARROW_PEERING)
-            y += Inches(0.5)
+                               font_size=14, bold=True, color=PALETTE.ARROW_PEERING)
+            y += IN[0.5]
 
             for peer in peerings:
                 text = (f"{peer['name']}: "
                         f"{peer['requester_vpc']} ({peer['requester_cidr']}) "
                         f"<-> {peer['accepter_vpc']} ({peer['accepter_cidr']})")
-                self._add_text_box(slide, Inches(0.5), y, Inches(10), Inches(0.22),
+                self._add_text_box(slide, IN[0.5], y, IN[10], IN[0.22],
                                    text, font_size=9)
-                y += Inches(0.3)
+                y += IN[0.3]
 
         # Outbound flows
-        y += Inches(0.2)
-        self._add_text_box(slide, Inches(0.3), y, Inches(8), Inches(0.35),
+        y += IN[0.2]
+        self._add_text_box(slide, IN[0.3], y, IN[8], IN[0.35],
                            "OUTBOUND Traffic (Internal -> Internet)",
-                           font_size=14, bold=True, color=RGBColor(0xFF, 0x8F, 0x00))
-        y += Inches(0.5)
+                           font_size=14, bold=True, color=PALETTE.ARROW_NAT)
+        y += IN[0.5]
 
         for vpc in vpcs:
-            sgs = self.parser.get_security_groups_for_vpc(vpc["id"])
-            has_outbound = False
-            for sg in sgs:
-                for rule in sg.get("egress", []):
-                    for ipr in AWSConfigParser._normalize_ip_ranges(rule.get("ipRanges", [])):
-                        if ipr.get("cidrIp") == "0.0.0.0/0":
-                            if not has_outbound:
-                                self._add_text_box(slide, Inches(0.5), y, Inches(8), Inches(0.25),
-                                                   f"VPC: {vpc['name']}", font_size=11, bold=True)
-                                y += Inches(0.35)
-                                has_outbound = True
-                            text = (f"{sg['name']} -> :{rule.get('fromPort', 'all')} -> "
-                                    f"0.0.0.0/0 ({ipr.get('description', '')})")
-                            self._add_text_box(slide, Inches(0.7), y, Inches(10), Inches(0.22),
-                                               text, font_size=9)
-                            y += Inches(0.25)
+            open_egress = self.parser.get_open_egress_rules(vpc["id"])
+            if not open_egress:
+                continue
+            self._add_text_box(slide, IN[0.5], y, IN[8], IN[0.25],
+                               f"VPC: {vpc['name']}", font_size=11, bold=True)
+            y += IN[0.35]
+            for rule in open_egress:
+                text = (f"{rule['sg_name']} -> :{rule['from_port']} -> "
+                        f"0.0.0.0/0 ({rule['description']})")
+                self._add_text_box(slide, IN[0.7], y, IN[10], IN[0.22],
+                                   text, font_size=9)
+                y += IN[0.25]
 
     # ----------------------------------------------------------
     # Drawing Helpers
     # ----------------------------------------------------------
+    @staticmethod
+    def _apply_style(shape, fill_color: Color | None, border_color: Color,
+                     line_width: int) -> None:
+        """Apply fill (None = transparent) and border to a shape."""
+        fill = shape.fill
+        if fill_color:
+            fill.solid()
+            fill.fore_color.rgb = _rgb(fill_color)
+        else:
+            fill.background()
+        line = shape.line
+        line.color.rgb = _rgb(border_color)
+        line.width = line_width
+
     def _add_rounded_rect(self, slide, x, y, w, h, text, fill_color, border_color,
                            font_size=10, bold=False):
+        key = ("rect", fill_color, border_color, font_size, bold, bool(text))
+        proto = self._prototypes.get(key)
+        if proto is not None:
+            return self._clone_prototype(slide, proto, "Rounded Rectangle",
+                                         x, y, w, h, text)
+
         shape = slide.shapes.add_shape(MSO_SHAPE.ROUNDED_RECTANGLE, x, y, w, h)
-        shape.fill.solid()
-        shape.fill.fore_color.rgb = fill_color
-        shape.line.color.rgb = border_color
-        shape.line.width = Pt(1.5)
+        self._apply_style(shape, fill_color, border_color, PT[1.5])
 
         # Adjust corner radius
         shape.adjustments[0] = 0.05
@@ -2277,70 +2887,98 @@ class DiagramGenerator:
         tf = shape.text_frame
         tf.word_wrap = True
         tf.auto_size = None
-        tf.margin_left = Pt(4)
-        tf.margin_right = Pt(4)
-        tf.margin_top = Pt(2)
-        tf.margin_bottom = Pt(2)
+        tf.margin_left = PT[4]
+        tf.margin_right = PT[4]
+        tf.margin_top = PT[2]
+        tf.margin_bottom = PT[2]
 
         if text:
             p = tf.paragraphs[0]
             p.text = text
-            p.font.size = Pt(font_size)
+            p.font.size = PT[font_size]
             p.font.bold = bold
-            p.font.color.rgb = Colors.TEXT_BLACK
+            p.font.color.rgb = _rgb(PALETTE.TEXT_BLACK)
             p.alignment = PP_ALIGN.CENTER
-            tf.paragraphs[0].space_before = Pt(0)
-            tf.paragraphs[0].space_after = Pt(0)
+            tf.paragraphs[0].space_before = PT[0]
+            tf.paragraphs[0].space_after = PT[0]
 
+        self._prototypes[key] = self._make_prototype(shape)
         return shape
 
     def _add_text_box(self, slide, x, y, w, h, text, font_size=10,
-                       bold=False, color=None, align=PP_ALIGN.LEFT):
+                       bold=False, color=None, align=None):
+        if align is None:
+            align = PP_ALIGN.LEFT
+        color = color or PALETTE.TEXT_BLACK
+        key = ("text", font_size, bold, color, align)
+        proto = self._prototypes.get(key)
+        if proto is not None:
+            return self._clone_prototype(slide, proto, "TextBox",
+                                         x, y, w, h, text)
+
         txBox = slide.shapes.add_textbox(x, y, w, h)
         tf = txBox.text_frame
         tf.word_wrap = True
         p = tf.paragraphs[0]
         p.text = text
-        p.font.size = Pt(font_size)
+        p.font.size = PT[font_size]
         p.font.bold = bold
-        p.font.color.rgb = color or Colors.TEXT_BLACK
+        p.font.color.rgb = _rgb(color)
         p.alignment = align
-        p.space_before = Pt(0)
-        p.space_after = Pt(0)
+        p.space_before = PT[0]
+        p.space_after = PT[0]
+
+        self._prototypes[key] = self._make_prototype(txBox)
         return txBox
 
-    def _add_arrow(self, slide, x1, y1, x2, y2, color, width=Pt(1.5), label=None):
-        """Add an arrow connector with arrowhead via direct XML manipulation."""
-        from pptx.oxml.ns import qn
-        from lxml import etree
+    @staticmethod
+    def _make_prototype(shape):
+        """Return a copy of a styled shape's p:sp without its paragraph text."""
+        sp = copy.deepcopy(shape._element)
+        p = sp.txBody.p_lst[0]
+        for child in p.content_children:
+            p.remove(child)
+        return sp
+
+    @staticmethod
+    def _clone_prototype(slide, proto, basename, x, y, w, h, text):
+        """Append a copy of `proto` at (x, y, w, h) holding `text`.
+
+        Produces the same p:sp python-pptx would build for the style the
+        prototype was made from, without re-running its per-property
+        element lookups.
+        """
+        shapes = slide.shapes
+        sp = copy.deepcopy(proto)
+        shape_id = shapes._next_shape_id
+        cNvPr = sp.nvSpPr.cNvPr
+        cNvPr.id = shape_id
+        cNvPr.name = f"{basename} {shape_id - 1}"
+        sp.x, sp.y, sp.cx, sp.cy = int(x), int(y), int(w), int(h)
+        if text:
+            sp.txBody.p_lst[0].append_text(text)
+        shapes._spTree.insert_element_before(sp, "p:extLst")
+        return PptxShape(sp, shapes)
+
+    def _add_arrow(self, slide, x1, y1, x2, y2, color, width=None, label=None):
+        """Add an arrow connector with arrowhead via direct XML manipulation.
+
+        The first arrow of each (color, width) is built through python-pptx
+        and kept as a prototype; later ones are copies of it.
+        """
+        if width is None:
+            width = PT[1.5]
 
         # Ensure coordinates are integers (EMU units)
         x1, y1, x2, y2 = int(x1), int(y1), int(x2), int(y2)
 
-        connector = slide.shapes.add_connector(
-            1,  # straight connector
-            x1, y1, x2, y2
-        )
-        connector.line.color.rgb = color
-        connector.line.width = width
-
-        # Add arrowhead via XML (most reliable method for python-pptx)
-        cxnSp = connector._element
-        spPr = cxnSp.find(qn('p:spPr'))
-        if spPr is None:
-            spPr = cxnSp.find(qn('p:cxnSp/p:spPr'))
-
-        ln = spPr.find(qn('a:ln'))
-        if ln is None:
-            ln = etree.SubElement(spPr, qn('a:ln'))
-
-        # End arrow (triangle)
-        tailEnd = ln.find(qn('a:tailEnd'))
-        if tailEnd is None:
-            tailEnd = etree.SubElement(ln, qn('a:tailEnd'))
-        tailEnd.set('type', 'triangle')
-        tailEnd.set('w', 'med')
-        tailEnd.set('len', 'med')
+        key = ("arrow", color, width)
+        proto = self._prototypes.get(key)
+        if proto is not None:
+            self._clone_connector(slide, proto, x1, y1, x2, y2)
+        else:
+            self._prototypes[key] = copy.deepcopy(
+                self._new_arrow(slide, x1, y1, x2, y2, color, width))
 
         # Add label near midpoint
         if label:
@@ -2348,97 +2986,197 @@ class DiagramGenerator:
             mid_y = (y1 + y2) / 2
 
             # Offset label slightly to not overlap the line
-            offset_x = Inches(0.05)
-            offset_y = -Inches(0.18)
+            offset_x = IN[0.05]
+            offset_y = -IN[0.18]
 
             # For mostly vertical lines, offset to the right
             if abs(y2 - y1) > abs(x2 - x1):
-                offset_x = Inches(0.15)
-                offset_y = -Inches(0.05)
+                offset_x = IN[0.15]
+                offset_y = -IN[0.05]
 
             self._add_text_box(slide,
-                               mid_x + offset_x - Inches(0.35),
+                               mid_x + offset_x - IN[0.35],
                                mid_y + offset_y,
-                               Inches(0.9), Inches(0.22),
+                               IN[0.9], IN[0.22],
                                label, font_size=7, color=color,
                                align=PP_ALIGN.CENTER, bold=True)
 
-    def _draw_table_row(self, slide, x, y, col_widths, values,
-                         bold=False, bg_color=None):
-        """Draw a table-like row using rectangles."""
-        cx = x
-        for i, (val, cw) in enumerate(zip(values, col_widths)):
-            shape = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, cx, y, cw, Inches(0.28))
-            if bg_color:
-                shape.fill.solid()
-                shape.fill.fore_color.rgb = bg_color
+    @staticmethod
+    def _new_arrow(slide, x1, y1, x2, y2, color, width):
+        """Add a styled straight connector with a triangle head; return its p:cxnSp."""
+        connector = slide.shapes.add_connector(
+            1,  # straight connector
+            x1, y1, x2, y2
+        )
+        connector.line.color.rgb = _rgb(color)
+        connector.line.width = width
+
+        # Add arrowhead via XML (most reliable method for python-pptx).
+        # Setting the line width above already created <a:ln>, and a fresh
+        # connector never carries a tailEnd, so a copy of the template is
+        # appended without looking for an existing one.
+        cxnSp = connector._element
+        cxnSp.spPr.get_or_add_ln().append(copy.deepcopy(_TAILEND_TEMPLATE))
+        return cxnSp
+
+    @staticmethod
+    def _clone_connector(slide, proto, x1, y1, x2, y2):
+        """Append a copy of a styled arrow prototype from (x1, y1) to (x2, y2).
+
+        Mirrors python-pptx's add_connector geometry: the box is the
+        bounding rectangle and flipH/flipV encode the direction.
+        """
+        shapes = slide.shapes
+        cxnSp = copy.deepcopy(proto)
+        shape_id = shapes._next_shape_id
+        cNvPr = cxnSp.nvCxnSpPr.cNvPr
+        cNvPr.id = shape_id
+        cNvPr.name = f"Connector {shape_id - 1}"
+        xfrm = cxnSp.spPr.xfrm
+        xfrm.attrib.pop("flipH", None)
+        xfrm.attrib.pop("flipV", None)
+        if x1 > x2:
+            xfrm.set("flipH", "1")
+        if y1 > y2:
+            xfrm.set("flipV", "1")
+        cxnSp.x, cxnSp.y = min(x1, x2), min(y1, y2)
+        cxnSp.cx, cxnSp.cy = abs(x2 - x1), abs(y2 - y1)
+        shapes._spTree.insert_element_before(cxnSp, "p:extLst")
+
+    def _add_table(self, slide, x, y, col_widths, rows, row_h, styles,
+                   border=None):
+        """Draw rows of cell values as a single native pptx table.
+
+        Args:
+            slide: Slide to draw on.
+            x: Left edge.
+            y: Top edge.
+            col_widths: Width of each column.
+            rows: Cell values per row (converted with str()).
+            row_h: Height of every row.
+            styles: Per-row (fill_color, font_color, bold); a None fill is
+                transparent and a None font color is TEXT_BLACK.
+            border: Color of a 0.5pt outline on every cell edge; None draws
+                no lines rather than the theme table style's borders.
+
+        Returns:
+            Total height of the table.
+        """
+        frame = slide.shapes.add_table(len(rows), len(col_widths), x, y,
+                                       sum(col_widths), row_h * len(rows))
+        table = frame.table
+        # Cells are styled explicitly; don't let the theme table style
+        # re-color the first row or band the rest.
+        table.first_row = False
+        table.horz_banding = False
+        for col, cw in zip(table.columns, col_widths):
+            col.width = cw
+        edges = self._cell_edges(border)
+        for tr, values, (fill_color, font_color, bold) in zip(table.rows, rows, styles):
+            tr.height = row_h
+            rgb = _rgb(font_color or PALETTE.TEXT_BLACK)
+            for cell, val in zip(tr.cells, values):
+                if fill_color:
+                    cell.fill.solid()
+                    cell.fill.fore_color.rgb = _rgb(fill_color)
+                else:
+                    cell.fill.background()
+                # python-pptx has no cell border API; the edges precede the
+                # fill in a:tcPr
+                cell._tc.get_or_add_tcPr()[0:0] = [copy.deepcopy(e) for e in edges]
+                cell.margin_left = PT[3]
+                cell.margin_right = PT[3]
+                cell.margin_top = PT[1]
+                cell.margin_bottom = PT[1]
+                p = cell.text_frame.paragraphs[0]
+                p.text = str(val)
+                p.font.size = PT[7]
+                p.font.bold = bold
+                p.font.color.rgb = rgb
+                p.alignment = PP_ALIGN.LEFT
+        return row_h * len(rows)
+
+    @staticmethod
+    def _cell_edges(border):
+        """Build a:lnL/lnR/lnT/lnB for a table cell: 0.5pt solid border, or noFill."""
+        edges = []
+        for tag in _QN_CELL_EDGES:
+            ln = etree.Element(tag)
+            if border is None:
+                etree.SubElement(ln, f"{{{_NS_A}}}noFill")
             else:
-                shape.fill.background()
-            shape.line.color.rgb = RGBColor(0xCC, 0xCC, 0xCC)
-            shape.line.width = Pt(0.5)
-
-            tf = shape.text_frame
-            tf.margin_left = Pt(3)
-            tf.margin_right = Pt(3)
-            tf.margin_top = Pt(1)
-            tf.margin_bottom = Pt(1)
-            p = tf.paragraphs[0]
-            p.text = str(val)
-            p.font.size = Pt(7)
-            p.font.bold = bold
-            p.alignment = PP_ALIGN.LEFT
+                ln.set("w", str(PT[0.5]))
+                fill = etree.SubElement(ln, f"{{{_NS_A}}}solidFill")
+                etree.SubElement(fill, f"{{{_NS_A}}}srgbClr").set("val", str(_rgb(border)))
+            edges.append(ln)
+        return edges
 
-            cx += cw
+    _legend_layout_cache = None
+
+    @classmethod
+    def _legend_layout(cls):
+        """Return the legend as (kind, dx, dy, w, h, text, style) offsets from its origin.
+
+        kind is "rect" (style = (fill, border)) or "text"
+        (style = (font_size, bold, color)). Built once; every value is a
+        constant of the palette.
+        """
+        if cls._legend_layout_cache is not None:
+            return cls._legend_layout_cache
 
-    def _add_legend(self, slide, x, y):
-        """Add color legend."""
         items = [
-            ("Public Subnet", Colors.PUBLIC_FILL, Colors.PUBLIC_BORDER),
-            ("Private Subnet", Colors.PRIVATE_FILL, Colors.PRIVATE_BORDER),
-            ("Isolated Subnet", Colors.ISOLATED_FILL, Colors.ISOLATED_BORDER),
-            ("WAF", Colors.WAF_FILL, Colors.WAF_BORDER),
-            ("Internet GW", Colors.IGW_FILL, Colors.IGW_BORDER),
-            ("NAT Gateway", Colors.NAT_FILL, Colors.NAT_BORDER),
-            ("ALB", Colors.ALB_FILL, Colors.ALB_BORDER),
-            ("EC2", Colors.EC2_FILL, Colors.EC2_BORDER),
-            ("RDS", Colors.RDS_FILL, Colors.RDS_BORDER),
-            ("S3", Colors.S3_FILL, Colors.S3_BORDER),
+            ("Public Subnet", "Public"),
+            ("Private Subnet", "Private"),
+            ("Isolated Subnet", "Isolated"),
+            ("WAF", "WAF"),
+            ("Internet GW", "IGW"),
+            ("NAT Gateway", "NAT"),
+            ("ALB", "ALB"),
+            ("EC2", "EC2"),
+            ("RDS", "RDS"),
+            ("S3", "S3"),
+        ]
+        arrow_items = [
+            ("External Access", PALETTE.ARROW_EXTERNAL),
+            ("Internal Traffic", PALETTE.ARROW_INTERNAL),
+            ("NAT Outbound", PALETTE.ARROW_NAT),
+            ("VPC Peering", PALETTE.ARROW_PEERING),
+            ("S3 Access", PALETTE.S3_BORDER),
         ]
 
-        self._add_text_box(slide, x, y, Inches(2), Inches(0.25),
-                           "Legend:", font_size=8, bold=True)
-        ly = y + Inches(0.25)
-
-        for label, fill, border in items:
-            self._add_rounded_rect(slide, x, ly, Inches(0.3), Inches(0.2),
-                                    "", fill, border, font_size=6)
-            self._add_text_box(slide, x + Inches(0.35), ly, Inches(1.5), Inches(0.2),
-                               label, font_size=7)
-            ly += Inches(0.22)
+        layout = [("text", 0, 0, IN[2], IN[0.25], "Legend:", (8, True, None))]
+        dy = IN[0.25]
+        for label, style in items:
+            layout.append(("rect", 0, dy, IN[0.3], IN[0.2], "", PALETTE.STYLES[style]))
+            layout.append(("text", IN[0.35], dy, IN[1.5], IN[0.2], label, (7, False, None)))
+            dy += IN[0.22]
 
         # Arrow legends
-        ly += Inches(0.05)
-        arrow_items = [
-            ("External Access", Colors.ARROW_EXTERNAL),
-            ("Internal Traffic", Colors.ARROW_INTERNAL),
-            ("NAT Outbound", RGBColor(0xFF, 0x8F, 0x00)),
-            ("VPC Peering", Colors.ARROW_PEERING),
-            ("S3 Access", Colors.S3_BORDER),
-        ]
+        dy += IN[0.05]
         for label, color in arrow_items:
-            self._add_text_box(slide, x, ly, Inches(0.3), Inches(0.2),
-                               "-->", font_size=7, color=color, bold=True)
-            self._add_text_box(slide, x + Inches(0.35), ly, Inches(1.5), Inches(0.2),
-                               label, font_size=7)
-            ly += Inches(0.22)
+            layout.append(("text", 0, dy, IN[0.3], IN[0.2], "-->", (7, True, color)))
+            layout.append(("text", IN[0.35], dy, IN[1.5], IN[0.2], label, (7, False, None)))
+            dy += IN[0.22]
+
+        cls._legend_layout_cache = tuple(layout)
+        return cls._legend_layout_cache
+
+    def _add_legend(self, slide, x, y):
+        """Add color legend."""
+        for kind, dx, dy, w, h, text, style in self._legend_layout():
+            if kind == "rect":
+                fill, border = style
+                self._add_rounded_rect(slide, x + dx, y + dy, w, h,
+                                       text, fill, border, font_size=6)
+            else:
+                font_size, bold, color = style
+                self._add_text_box(slide, x + dx, y + dy, w, h, text,
+                                   font_size=font_size, bold=bold, color=color)
 
     def _tier_colors(self, tier):
-        if tier == "Public":
-            return Colors.PUBLIC_FILL, Colors.PUBLIC_BORDER
-        elif tier == "Isolated":
-            return Colors.ISOLATED_FILL, Colors.ISOLATED_BORDER
-        else:
-            return Colors.PRIVATE_FILL, Colors.PRIVATE_BORDER
+        if tier == "Public" or tier == "Isolated":
+            return PALETTE.STYLES[tier]
+        return PALETTE.STYLES["Private"]
 
 
 # ============================================================
@@ -2463,7 +3201,8 @@ def main():
 
     print(f"Found resources:")
     for rtype, items in sorted(parser.by_type.items()):
-        print(f"  {rtype}: {len(items)}")
+        if items:
+            print(f"  {rtype}: {len(items)}")
 
     print(f"\nGenerating diagram...")
     generator = DiagramGenerator(parser)
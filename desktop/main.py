@@ -4,7 +4,7 @@ desktop/main.py: AWS Config Diagram Generator - Desktop Entry Point
 PyInstaller exe / 開発時スクリプト兼用のエントリポイント。
 ダブルクリックで起動 → ブラウザが開く → 使う → コンソール閉じて終了。
 
-- ポート自動選択 (8000-8100)
+- ポート自動選択 (OS が空きポートを割り当て、失敗時は 8000-8100 を探索)
 - ブラウザ自動起動
 - レジストリ不使用・管理者権限不要
 """
@@ -17,13 +17,30 @@ import time
 import webbrowser
 
 
-def find_free_port(start: int = 8000, end: int = 8100) -> int:
-    """bind できるポートを探す。"""
+def _try_bind(port: int) -> int:
+    """127.0.0.1:port に bind できれば実際のポート番号を返す (0 なら OS が割り当て)。"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        # SO_REUSEADDR は付けない: Windows では他プロセスが listen 中の
+        # ポートにも bind が成功してしまう
+        s.bind(("127.0.0.1", port))
+        return s.getsockname()[1]
+
+
+def find_free_port(start: int | None = None, end: int = 8100) -> int:
+    """bind できるポートを探す。
+
+    start 省略時は port 0 に bind して OS に空きポートを割り当てさせる
+    (syscall 1 回)。start を指定した場合、または OS 割り当てに失敗した
+    場合は start (既定 8000) から end まで順に試す。
+    """
+    if start is None:
+        try:
+            return _try_bind(0)
+        except OSError:
+            start = 8000
     for port in range(start, end + 1):
         try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.bind(("127.0.0.1", port))
-                return port
+            return _try_bind(port)
         except OSError:
             continue
     raise RuntimeError(f"No free port found in range {start}-{end}")
@@ -45,9 +62,18 @@ def setup_paths() -> str:
     return base_dir
 
 
-def open_browser(port: int, delay: float = 1.5) -> None:
-    """uvicorn 起動を待ってからブラウザを開く。"""
-    time.sleep(delay)
+def open_browser(port: int, timeout: float = 10.0, interval: float = 0.05) -> None:
+    """uvicorn が接続を受け付けるまで待ってからブラウザを開く。
+
+    固定時間 sleep せず interval 秒ごとに connect を試し、timeout 秒
+    経っても応答がなければそのまま開く。
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            if s.connect_ex(("127.0.0.1", port)) == 0:
+                break
+        time.sleep(interval)
     url = f"http://127.0.0.1:{port}"
     print(f"  ブラウザを開きます: {url}")
     webbrowser.open(url)
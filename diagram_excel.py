@@ -1808,7 +1808,8 @@ def main():
 
     print(f"Parsing: {inp}")
     for rt, items in sorted(parser.by_type.items()):
-        print(f"  {rt}: {len(items)}")
+        if items:
+            print(f"  {rt}: {len(items)}")
 
     if "--list" in sys.argv:
         dg = DiagramExcel(parser)
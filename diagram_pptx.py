@@ -1724,7 +1724,8 @@ def main():
 
     print(f"Parsing: {inp}")
     for rt, items in sorted(parser.by_type.items()):
-        print(f"  {rt}: {len(items)}")
+        if items:
+            print(f"  {rt}: {len(items)}")
 
     # --list: show all VPCs and exit
     if "--list" in sys.argv:
@@ -1753,19 +1754,20 @@ def main():
         print(f"\n  --- Route Table existence check ---")
         rt_parsed = parser.by_type.get("AWS::EC2::RouteTable", [])
         print(f"    Parsed RouteTable count: {len(rt_parsed)}")
-        # Also scan raw JSON for any RouteTable items not captured by parser
-        rt_in_raw = 0
+        # Also scan raw JSON (before parser filter) for any RouteTable items
+        # not captured by parser; items are streamed, so keep only counts
+        # and the RouteTable items themselves
+        total_items = 0
+        all_rt = []
         rt_types_found = set()
-        for item in parser.items:
-            rt = item.get("resourceType", "")
+        for item in AWSConfigParser._iter_snapshot_items(inp):
+            total_items += 1
+            rt = item.get("resourceType") or ""
             if "RouteTable" in rt or "routeTable" in rt.lower():
-                rt_in_raw += 1
+                all_rt.append(item)
                 rt_types_found.add(rt)
-        print(f"    Raw JSON RouteTable items: {rt_in_raw}  types: {rt_types_found or 'none'}")
-        # Scan ALL items in original JSON (before parser filter)
-        all_items = parser.data.get("configurationItems", [])
-        all_rt = [it for it in all_items if "RouteTable" in it.get("resourceType", "")]
-        print(f"    Total configurationItems: {len(all_items)}")
+        print(f"    Raw JSON RouteTable items: {len(all_rt)}  types: {rt_types_found or 'none'}")
+        print(f"    Total configurationItems: {total_items}")
         print(f"    RouteTable in all items: {len(all_rt)}")
         for rt_item in all_rt[:5]:
             rid = rt_item.get("resourceId", "?")
@@ -104,18 +104,22 @@ class DiagramNode(BaseModel):
         populate_by_name = True
 
     def model_dump_camel(self) -> dict:
-        """TypeScript 側の camelCase フィールド名で出力"""
-        d = self.model_dump()
+        """TypeScript 側の camelCase フィールド名で出力
+
+        model_dump() の再帰シリアライズを経由せず、属性から直接組み立てる。
+        """
+        position = self.position
+        size = self.size
         return {
-            "id": d["id"],
-            "type": d["type"],
-            "label": d["label"],
-            "source": d["source"],
-            "isUserModified": d["is_user_modified"],
-            "position": d["position"],
-            "size": d["size"],
-            "parentId": d["parent_id"],
-            "metadata": d["metadata"],
+            "id": self.id,
+            "type": self.type,
+            "label": self.label,
+            "source": self.source,
+            "isUserModified": self.is_user_modified,
+            "position": {"x": position.x, "y": position.y},
+            "size": {"width": size.width, "height": size.height},
+            "parentId": self.parent_id,
+            "metadata": self.metadata,
         }
 
 
@@ -132,16 +136,15 @@ class DiagramEdge(BaseModel):
 
     def model_dump_camel(self) -> dict:
         """TypeScript 側の camelCase フィールド名で出力"""
-        d = self.model_dump()
         return {
-            "id": d["id"],
-            "type": d["type"],
-            "source": d["source"],
-            "sourceNodeId": d["source_node_id"],
-            "targetNodeId": d["target_node_id"],
-            "label": d["label"],
-            "isUserModified": d["is_user_modified"],
-            "metadata": d["metadata"],
+            "id": self.id,
+            "type": self.type,
+            "source": self.source,
+            "sourceNodeId": self.source_node_id,
+            "targetNodeId": self.target_node_id,
+            "label": self.label,
+            "isUserModified": self.is_user_modified,
+            "metadata": self.metadata,
         }
 
 
@@ -153,12 +156,11 @@ class DiagramMeta(BaseModel):
     config_snapshot_id: Optional[str] = None
 
     def model_dump_camel(self) -> dict:
-        d = self.model_dump()
         return {
-            "title": d["title"],
-            "createdAt": d["created_at"],
-            "updatedAt": d["updated_at"],
-            "configSnapshotId": d["config_snapshot_id"],
+            "title": self.title,
+            "createdAt": self.created_at,
+            "updatedAt": self.updated_at,
+            "configSnapshotId": self.config_snapshot_id,
         }
 
 
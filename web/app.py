@@ -8,10 +8,12 @@ AWS Config Diagram Generator の Web バックエンド。
     source venv/bin/activate && uvicorn web.app:app --reload --port 8000
 """
 
+import hashlib
 import json
 import os
 import sys
 import tempfile
+from collections import OrderedDict
 
 from fastapi import FastAPI, File, UploadFile, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
@@ -50,6 +52,38 @@ app.add_middleware(
 )
 
 
+# パース済みスナップショットのメモリ内キャッシュ（LRU）
+# 同じファイルで parse → export を繰り返す際の再パースを省く。
+# ディスクには永続化しない（Config JSON はメモリ上でのみ扱う）。
+_PARSER_CACHE_SIZE = 4
+_parser_cache: "OrderedDict[str, AWSConfigParser]" = OrderedDict()
+
+
+def _get_parser(content: bytes) -> AWSConfigParser:
+    """アップロード内容に対応する AWSConfigParser を返す（内容ハッシュでキャッシュ）"""
+    key = hashlib.sha256(content).hexdigest()
+    parser = _parser_cache.get(key)
+    if parser is not None:
+        _parser_cache.move_to_end(key)
+        return parser
+
+    # AWSConfigParser がファイルパスを要求するため一時ファイル経由でパース
+    with tempfile.NamedTemporaryFile(
+        mode="wb", suffix=".json", delete=False,
+    ) as tmp:
+        tmp.write(content)
+        tmp_path = tmp.name
+    try:
+        parser = AWSConfigParser(tmp_path)
+    finally:
+        os.unlink(tmp_path)
+
+    _parser_cache[key] = parser
+    if len(_parser_cache) > _PARSER_CACHE_SIZE:
+        _parser_cache.popitem(last=False)
+    return parser
+
+
 @app.get("/api/health")
 async def health_check():
     """ヘルスチェック"""
@@ -69,7 +103,6 @@ async def parse_config(file: UploadFile = File(...)):
     if not file.filename or not file.filename.endswith(".json"):
         raise HTTPException(status_code=400, detail="JSON ファイルを指定してください")
 
-    # 一時ファイルに保存（AWSConfigParser がファイルパスを要求するため）
     try:
         content = await file.read()
         # JSON として有効か検証
@@ -77,15 +110,9 @@ async def parse_config(file: UploadFile = File(...)):
     except (json.JSONDecodeError, UnicodeDecodeError):
         raise HTTPException(status_code=400, detail="無効な JSON ファイルです")
 
-    with tempfile.NamedTemporaryFile(
-        mode="wb", suffix=".json", delete=False,
-    ) as tmp:
-        tmp.write(content)
-        tmp_path = tmp.name
-
     try:
         # パース → DiagramState 変換 → レイアウト計算
-        parser = AWSConfigParser(tmp_path)
+        parser = _get_parser(content)
         converter = DiagramStateConverter(parser)
         title = os.path.splitext(file.filename)[0]
         state = converter.convert(title=title)
@@ -98,9 +125,6 @@ async def parse_config(file: UploadFile = File(...)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"パース処理エラー: {str(e)}")
 
-    finally:
-        os.unlink(tmp_path)
-
 
 @app.post("/api/export/xlsx")
 async def export_xlsx(file: UploadFile = File(...)):
@@ -125,14 +149,8 @@ async def _export_file(file: UploadFile, format: str) -> FileResponse:
     except (json.JSONDecodeError, UnicodeDecodeError):
         raise HTTPException(status_code=400, detail="無効な JSON ファイルです")
 
-    with tempfile.NamedTemporaryFile(
-        mode="wb", suffix=".json", delete=False,
-    ) as tmp:
-        tmp.write(content)
-        tmp_path = tmp.name
-
     try:
-        parser = AWSConfigParser(tmp_path)
+        parser = _get_parser(content)
         base_name = os.path.splitext(file.filename)[0]
 
         if format == "xlsx":
@@ -168,8 +186,6 @@ async def _export_file(file: UploadFile, format: str) -> FileResponse:
             status_code=500,
             detail=f"エクスポートエラー: {str(e)}",
         )
-    finally:
-        os.unlink(tmp_path)
 
 
 # ============================================================